@@ -0,0 +1,287 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+APP = Path(__file__).with_name("farmquest_app.py")
+LANGUAGES = ["English", "தமிழ்"]
+QUESTIONS = [
+    "How much water does rice need?", "best soil for wheat", "millets in dry land",
+    "which fertilizer is organic", "pests on tomato leaves", "government schemes",
+    "PM-KISAN benefits", "drip irrigation subsidy", "crop rotation and disease",
+    "coconut climate", "beginner guide", "how to start farming",
+]
+
+QUESTION_CYCLE = itertools.count()
+
+
+def summarize(samples):
+    ms = np.asarray(samples) * 1000
+    return {
+        "runs": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+    }
+
+
+# -------------------------------------------------
+# APP RERUNS
+# -------------------------------------------------
+# Scenario level meaning "every level cleared", resolved against the question bank
+ALL_LEVELS = "all"
+
+
+def logged_in_app(language, page, level=1):
+    from streamlit.testing.v1 import AppTest
+    from farmquest_questions import level_count
+
+    at = AppTest.from_file(str(APP), default_timeout=60).run()
+    at.text_input[0].input(f"bench-{time.monotonic_ns()}").run()
+    at.button[0].click().run()
+    [s for s in at.selectbox if s.label.startswith("🌐")][0].set_value(language).run()
+    if level == ALL_LEVELS:
+        level = level_count() + 1
+    if level != 1:
+        at.session_state.level = level
+    open_page(at, page)
+    return at
+
+
+def open_page(at, url_path):
+    # Pages are callables, which AppTest.switch_page cannot address by file,
+    # so select one by hash. A fragment-only rerun does not report the page
+    # registry, so run the whole script first to refresh it.
+    at.run()
+    page_hash = next(
+        (page_hash for page_hash, info in at._registered_pages.items() if info.get("url_pathname") == url_path),
+        None,
+    )
+    if page_hash is None:
+        raise RuntimeError(f"No page registered at /{url_path}")
+    at._page_hash = page_hash
+    at.run()
+
+
+def button(at, label):
+    return [b for b in at.button if b.label == label][0]
+
+
+def current_question(at):
+    from farmquest_questions import level_count, question_bank
+
+    # The sidebar is not re-rendered by a fragment rerun, so match the quiz
+    # radio against each language's bank instead of reading the selectbox
+    level = at.session_state.level
+    radio = at.radio(key=f"lvl{level}")
+    for language in LANGUAGES:
+        question = question_bank(language).level(at.session_state.username, level, level_count())
+        if question.question == radio.label:
+            return question, radio
+    raise RuntimeError(f"Quiz question {radio.label!r} is not in any bank")
+
+
+# Each scenario performs the interaction that triggers a rerun on one page
+def rerun_game_wrong(at):
+    question, radio = current_question(at)
+    radio.set_value(next(o for o in question.options if o != question.answer))
+    button(at, "✅ Submit").click().run()
+
+
+def rerun_game_correct(at):
+    # Saves progress, updates the leaderboard and reruns the quiz and sidebar fragments
+    question, radio = current_question(at)
+    radio.set_value(question.answer)
+    button(at, "✅ Submit").click().run()
+
+
+def restart_quiz(at):
+    from farmquest_questions import level_count
+
+    if at.session_state.level > level_count():
+        at.session_state.level = 1
+        at.run()
+
+
+def rerun_crops(at):
+    crop = [s for s in at.selectbox if s.label == "Select Crop"][0]
+    crop.set_value(crop.options[(crop.options.index(crop.value) + 1) % len(crop.options)]).run()
+
+
+def rerun_assistant(at):
+    at.text_input[0].input(QUESTIONS[next(QUESTION_CYCLE) % len(QUESTIONS)])
+    button(at, "💬 Ask AI").click().run()
+
+
+def rerun_certificate(at):
+    at.run()
+
+
+def rerun_leaderboard(at):
+    at.run()
+
+
+# name: (step, page, starting level, untimed setup before each step)
+SCENARIOS = {
+    "game_wrong": (rerun_game_wrong, "", 1, None),
+    "game_correct": (rerun_game_correct, "", 1, restart_quiz),
+    "crops": (rerun_crops, "crops", 1, None),
+    "assistant": (rerun_assistant, "guide", 1, None),
+    "certificate": (rerun_certificate, "knowledge", ALL_LEVELS, None),
+    "leaderboard": (rerun_leaderboard, "leaderboard", 1, None),
+}
+
+
+def bench_reruns(runs, warmup):
+    results = {}
+    for language in LANGUAGES:
+        for name, (step, page, level, setup) in SCENARIOS.items():
+            at = logged_in_app(language, page, level)
+            for _ in range(warmup):
+                if setup:
+                    setup(at)
+                step(at)
+            samples = []
+            for _ in range(runs):
+                if setup:
+                    setup(at)
+                start = time.perf_counter()
+                step(at)
+                samples.append(time.perf_counter() - start)
+                if at.exception:
+                    raise RuntimeError(f"{name}/{language}: {at.exception[0].message}")
+            results[f"{name}/{language}"] = summarize(samples)
+    return results
+
+
+# -------------------------------------------------
+# ASSISTANT AND CERTIFICATES
+# -------------------------------------------------
+def bench_assistant(queries):
+    from farmquest_assistant import AssistantEngine, build_documents
+
+    results = {}
+    for language in LANGUAGES:
+        engine = AssistantEngine(build_documents(language))
+        # Unique suffixes defeat the answer cache for the cold numbers
+        cold = [f"{QUESTIONS[i % len(QUESTIONS)]} {i}" for i in range(queries)]
+
+        start = time.perf_counter()
+        for q in cold:
+            engine.ask(q)
+        single = time.perf_counter() - start
+
+        engine._cache.clear()
+        start = time.perf_counter()
+        engine.ask_many(cold)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in cold:
+            engine.ask(q)
+        cached = time.perf_counter() - start
+
+        results[language] = {
+            "queries": queries,
+            "single_qps": round(queries / single, 1),
+            "batch_qps": round(queries / batch, 1),
+            "cached_qps": round(queries / cached, 1),
+        }
+    return results
+
+
+def bench_certificates(count):
+    from farmquest_certificate import generate_certificate, render_certificate
+
+    today = date.today()
+    start = time.perf_counter()
+    for i in range(count):
+        render_certificate(f"Player {i}", today)
+    rendered = time.perf_counter() - start
+
+    generate_certificate("Cached Player", today)
+    start = time.perf_counter()
+    for _ in range(count):
+        generate_certificate("Cached Player", today)
+    cached = time.perf_counter() - start
+
+    return {
+        "count": count,
+        "rendered_pdfs_per_s": round(count / rendered, 1),
+        "cached_pdfs_per_s": round(count / cached, 1),
+    }
+
+
+# -------------------------------------------------
+# REGRESSION CHECK
+# -------------------------------------------------
+def compare(current, baseline, tolerance):
+    regressions = []
+    for key, stats in current["reruns"].items():
+        old = baseline.get("reruns", {}).get(key)
+        if old and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"rerun {key}: p95 {old['p95_ms']} -> {stats['p95_ms']} ms")
+    for language, stats in current["assistant"].items():
+        old = baseline.get("assistant", {}).get(language)
+        if old and stats["single_qps"] < old["single_qps"] / (1 + tolerance):
+            regressions.append(f"assistant {language}: {old['single_qps']} -> {stats['single_qps']} q/s")
+    old = baseline.get("certificates")
+    new = current["certificates"]
+    if old and new["rendered_pdfs_per_s"] < old["rendered_pdfs_per_s"] / (1 + tolerance):
+        regressions.append(f"certificates: {old['rendered_pdfs_per_s']} -> {new['rendered_pdfs_per_s']} PDFs/s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FarmQuest reruns, assistant and certificates")
+    parser.add_argument("--runs", type=int, default=30, help="timed reruns per page and language")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--certificates", type=int, default=50)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(APP.parent))
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep benchmark players out of the real progress database and analytics
+        os.environ["FARMQUEST_DB"] = os.path.join(tmp, "bench.db")
+        os.environ["FARMQUEST_EVENTS"] = "off"
+        results = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "reruns": bench_reruns(args.runs, args.warmup),
+            "assistant": bench_assistant(args.queries),
+            "certificates": bench_certificates(args.certificates),
+        }
+
+    Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    for key, stats in results["reruns"].items():
+        print(f"{key:28} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms")
+    for language, stats in results["assistant"].items():
+        print(f"assistant/{language:18} {stats['single_qps']:10.1f} q/s  batch {stats['batch_qps']:10.1f} q/s")
+    print(f"certificates{'':16} {results['certificates']['rendered_pdfs_per_s']:10.1f} PDFs/s")
+    print(f"saved {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# -------------------------------------------------
+# EVENT LOG
+# -------------------------------------------------
+# emit() only appends to an in-memory buffer under a lock, so the Streamlit script thread
+# never waits on disk. A background thread drains the buffer in batches.
+class EventLog:
+    def __init__(self, directory, fmt="jsonl", flush_interval=2.0, batch_size=500,
+                 max_buffer=50_000, rotate_bytes=16 * 1024 * 1024):
+        if fmt == "parquet" and pq is None:
+            fmt = "jsonl"
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.rotate_bytes = rotate_bytes
+        self.dropped = 0
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._file = None
+        self._file_day = None
+        self._seq = 0
+        self._writer = threading.Thread(target=self._run_writer, name="analytics-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def emit(self, kind, **fields):
+        event = {"ts": time.time(), "kind": kind, **fields}
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                # Losing the oldest events beats growing without bound if the disk stalls
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = list(self._buffer), deque()
+            if not batch:
+                return 0
+            try:
+                if self.fmt == "parquet":
+                    self._write_parquet(batch)
+                else:
+                    self._write_jsonl(batch)
+            except Exception:
+                with self._lock:
+                    self._buffer.extendleft(reversed(batch))
+                raise
+            return len(batch)
+
+    def _next_path(self, suffix):
+        self._seq += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.directory / f"events-{stamp}-{os.getpid()}-{self._seq}.{suffix}"
+
+    def _write_jsonl(self, batch):
+        day = time.strftime("%Y%m%d")
+        if self._file is None or self._file_day != day or self._file.tell() >= self.rotate_bytes:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self._next_path("jsonl"), "a", encoding="utf-8")
+            self._file_day = day
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch))
+        self._file.flush()
+
+    def _write_parquet(self, batch):
+        # Parquet files cannot be appended to, so every batch is its own part file
+        path = self._next_path("parquet")
+        tmp = path.with_suffix(".tmp")
+        # Go through pandas so columns only some event kinds carry are kept
+        pq.write_table(pa.Table.from_pandas(pd.DataFrame(batch), preserve_index=False), tmp)
+        os.replace(tmp, path)
+
+    def _run_writer(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                # Keep the writer alive; the batch is retried on the next tick
+                pass
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class NullEventLog:
+    dropped = 0
+
+    def emit(self, kind, **fields):
+        pass
+
+    def flush(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+def open_event_log(directory, fmt="jsonl"):
+    # "off" disables collection without touching the call sites
+    if not directory or directory == "off":
+        return NullEventLog()
+    return EventLog(directory, fmt=fmt)
+
+
+# -------------------------------------------------
+# SUMMARY JOB
+# -------------------------------------------------
+def load_events(directory):
+    directory = Path(directory)
+    frames = []
+    for path in sorted(directory.glob("events-*.jsonl")):
+        # Parsed with json rather than read_json, which would turn queries or
+        # usernames like "2024" into numbers
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        if rows:
+            frames.append(pd.DataFrame(rows))
+    frames += [pd.read_parquet(path) for path in sorted(directory.glob("events-*.parquet"))]
+    if not frames:
+        return pd.DataFrame(columns=["ts", "kind"])
+    events = pd.concat(frames, ignore_index=True)
+    events["ts"] = pd.to_datetime(events["ts"], unit="s")
+    return events.sort_values("ts", kind="stable").reset_index(drop=True)
+
+
+def wrong_answer_rates(events):
+    quiz = events[events["kind"] == "quiz_submit"]
+    if quiz.empty:
+        return pd.DataFrame(columns=["level", "question_id", "attempts", "wrong", "wrong_rate"])
+    # Other event kinds leave NaN in these columns, which turns them into floats
+    quiz = quiz.assign(level=quiz["level"].astype(int), wrong=~quiz["correct"].astype(bool))
+    rates = (
+        quiz.groupby(["level", "question_id"], as_index=False)
+        .agg(attempts=("wrong", "size"), wrong=("wrong", "sum"))
+    )
+    rates["wrong_rate"] = (rates["wrong"] / rates["attempts"]).round(3)
+    return rates.sort_values(["wrong_rate", "attempts"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def unanswered_terms(events, top=20):
+    from farmquest_assistant import tokenize
+
+    queries = events[events["kind"] == "assistant_query"]
+    if queries.empty:
+        return pd.DataFrame(columns=["term", "queries"])
+    # The assistant reports no source when it fell back to its canned reply
+    missed = queries[queries["source"].isna()]
+    counts = Counter(term for query in missed["query"] for term in set(tokenize(query)))
+    return pd.DataFrame(counts.most_common(top), columns=["term", "queries"])
+
+
+def summarize(events, top=20):
+    return {
+        "events": events.groupby("kind").size().rename("count").reset_index(),
+        "wrong_answers": wrong_answer_rates(events),
+        "unanswered_terms": unanswered_terms(events, top),
+    }
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize FarmQuest analytics events")
+    parser.add_argument("directory", help="event directory written by the app (FARMQUEST_EVENTS)")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--csv", help="write each table to <prefix>_<table>.csv instead of printing")
+    args = parser.parse_args(argv)
+
+    if not Path(args.directory).is_dir():
+        parser.error(f"No event directory at {args.directory}")
+    tables = summarize(load_events(args.directory), args.top)
+    for name, table in tables.items():
+        if args.csv:
+            table.to_csv(f"{args.csv}_{name}.csv", index=False)
+        else:
+            print(f"\n== {name} ==")
+            print(table.head(args.top).to_string(index=False) if len(table) else "(none)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from farmquest_assistant import get_engine
+from farmquest_certificate import render_certificate
+from farmquest_content import LANGUAGES, crop_data, language_pack
+from farmquest_metrics import timed
+from farmquest_progress import open_progress_store
+from farmquest_questions import level_count, question_bank
+
+MAX_BODY = 1024 * 1024
+MAX_HEADERS = 100
+MAX_BATCH = 500
+IDLE_TIMEOUT = 15.0
+# Headers and body must arrive within this, so a trickling client cannot pin a connection
+READ_TIMEOUT = 10.0
+REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------------------------------
+# ASSISTANT BATCHING
+# -------------------------------------------------
+# Concurrent single-question requests are gathered for a few milliseconds and
+# scored with one ask_many() call, so a burst costs one matrix product.
+class AssistantBatcher:
+    def __init__(self, language, window=0.005, max_batch=64):
+        self.language = language
+        self.window = window
+        self.max_batch = max_batch
+        self._waiting = []
+        self._flush = None
+
+    async def ask(self, question):
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append((question, future))
+        if len(self._waiting) >= self.max_batch:
+            self._flush_now()
+        elif self._flush is None:
+            self._flush = asyncio.get_running_loop().call_later(self.window, self._flush_now)
+        return await future
+
+    def _flush_now(self):
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        batch, self._waiting = self._waiting, []
+        if batch:
+            asyncio.ensure_future(self._answer(batch))
+
+    async def _answer(self, batch):
+        try:
+            answers = await asyncio.to_thread(get_engine(self.language).ask_many, [q for q, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+
+# -------------------------------------------------
+# HANDLERS
+# -------------------------------------------------
+def pick_language(value):
+    language = value or "English"
+    if language not in LANGUAGES:
+        raise ApiError(400, f"Unknown language {language!r}; expected one of {list(LANGUAGES)}")
+    return language
+
+
+def answer_json(answer):
+    return {"answer": answer.text, "score": round(answer.score, 3), "source": answer.source}
+
+
+class FarmQuestAPI:
+    def __init__(self, workers=None, batch_window=0.005, progress_store=None):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.progress_store = progress_store or open_progress_store(
+            os.environ.get("FARMQUEST_DB", "farmquest_progress.db")
+        )
+        self.batchers = {language: AssistantBatcher(language, batch_window) for language in LANGUAGES}
+        self.crops = {name.lower(): name for name in crop_data}
+        self.level_count = level_count()
+        self.routes = {
+            ("GET", "health"): self.health,
+            ("GET", "crops"): self.get_crops,
+            ("GET", "schemes"): self.get_schemes,
+            ("POST", "grade"): self.grade,
+            ("POST", "assistant"): self.assistant,
+            ("POST", "certificate"): self.certificate,
+        }
+
+    async def health(self, args, query, body):
+        return {"status": "ok", "levels": self.level_count}
+
+    async def get_crops(self, args, query, body):
+        if not args:
+            return {"crops": list(crop_data)}
+        name = self.crops.get(args[0].lower())
+        if name is None:
+            raise ApiError(404, f"Unknown crop {args[0]!r}")
+        return {"crop": name, **crop_data[name]}
+
+    async def get_schemes(self, args, query, body):
+        language = pick_language(query.get("language"))
+        return {"language": language, "schemes": language_pack(language).gov_schemes}
+
+    def grade_one(self, item):
+        if not isinstance(item, dict) or "question_id" not in item or "answer" not in item:
+            raise ApiError(400, "Each grade item needs question_id and answer")
+        question = question_bank(pick_language(item.get("language"))).find(item["question_id"])
+        if question is None:
+            raise ApiError(404, f"Unknown question {item['question_id']!r}")
+        # The correct option is never echoed back, so the API cannot be used to harvest the answer key
+        return {"question_id": question.id, "correct": item["answer"] == question.answer}
+
+    async def grade(self, args, query, body):
+        if not isinstance(body, list):
+            return self.grade_one(body)
+        # A JSON list grades a whole batch in one round trip; bad items report
+        # their own error instead of failing the batch
+        if len(body) > MAX_BATCH:
+            raise ApiError(413, f"At most {MAX_BATCH} items per batch")
+        results = []
+        for item in body:
+            try:
+                results.append(self.grade_one(item))
+            except ApiError as e:
+                results.append({"question_id": item.get("question_id") if isinstance(item, dict) else None,
+                                "error": str(e)})
+        return results
+
+    async def assistant(self, args, query, body):
+        if not isinstance(body, dict):
+            raise ApiError(400, "Expected a JSON object")
+        language = pick_language(body.get("language"))
+        if "questions" in body:
+            questions = body["questions"]
+            if not isinstance(questions, list) or not all(isinstance(q, str) for q in questions):
+                raise ApiError(400, "questions must be a list of strings")
+            if len(questions) > MAX_BATCH:
+                raise ApiError(413, f"At most {MAX_BATCH} questions per batch")
+            answers = await asyncio.to_thread(get_engine(language).ask_many, questions)
+            return {"answers": [answer_json(a) for a in answers]}
+        question = body.get("question")
+        if not isinstance(question, str) or not question.strip():
+            raise ApiError(400, "question must be a non-empty string")
+        return answer_json(await self.batchers[language].ask(question))
+
+    async def certificate(self, args, query, body):
+        if not isinstance(body, dict) or not str(body.get("username", "")).strip():
+            raise ApiError(400, "username is required")
+        username = str(body["username"]).strip()
+        # SQLite reads block, so keep them off the event loop
+        progress = await asyncio.to_thread(self.progress_store.load, username)
+        if progress is None:
+            raise ApiError(404, f"Unknown player {username!r}")
+        if not progress.completed_at:
+            raise ApiError(403, f"{username} has not completed all {self.level_count} levels yet")
+        # Same date the app and the cohort export print for this player
+        completed_on = datetime.fromtimestamp(progress.completed_at).date()
+        # reportlab holds the GIL for the whole build, so PDFs go to worker processes
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool, render_certificate, username, completed_on, self.level_count
+        )
+
+    async def dispatch(self, method, target, raw_body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        if not parts:
+            raise ApiError(404, "Not found")
+        handler = self.routes.get((method, parts[0]))
+        if handler is None:
+            if any(route == parts[0] for _, route in self.routes):
+                raise ApiError(405, f"{method} not allowed on /{parts[0]}")
+            raise ApiError(404, "Not found")
+
+        body = None
+        if raw_body:
+            try:
+                body = json.loads(raw_body)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                raise ApiError(400, "Body must be JSON")
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        with timed(f"api:{parts[0]}"):
+            return await handler(parts[1:], query, body)
+
+    # -------------------------------------------------
+    # HTTP/1.1 CONNECTIONS
+    # -------------------------------------------------
+    async def read_request(self, reader):
+        line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise ApiError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ApiError(400, "Too many headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise ApiError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise ApiError(400, "Bad Content-Length")
+        if length < 0:
+            raise ApiError(400, "Bad Content-Length")
+        if length > MAX_BODY:
+            raise ApiError(413, f"Body larger than {MAX_BODY} bytes")
+        body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, body, keep_alive
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except ApiError as e:
+                    await self.respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                try:
+                    status, result = 200, await self.dispatch(method, target, body)
+                except ApiError as e:
+                    status, result = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self.respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Shutdown cancels idle connections; finishing quietly keeps the
+            # stream protocol's done-callback from logging the cancellation
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, result, keep_alive):
+        if isinstance(result, bytes):
+            content_type, payload = "application/pdf", result
+        else:
+            content_type = "application/json; charset=utf-8"
+            payload = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# -------------------------------------------------
+# LOCAL TEST CLIENT
+# -------------------------------------------------
+# Runs the service on an ephemeral localhost port in a background thread and
+# talks to it over one keep-alive connection.
+class LocalClient:
+    def __init__(self, workers=1, progress_store=None):
+        self.api = FarmQuestAPI(workers=workers, progress_store=progress_store)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="farmquest-api", daemon=True)
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(self.api.start("127.0.0.1", 0), self._loop).result()
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+
+    def request(self, method, path, body=None):
+        payload = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if payload else {}
+        self._conn.request(method, path, body=payload, headers=headers)
+        response = self._conn.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            data = json.loads(data)
+        return response.status, data
+
+    def get(self, path):
+        return self.request("GET", path)
+
+    def post(self, path, body):
+        return self.request("POST", path, body)
+
+    async def _shutdown(self):
+        self._server.close()
+        # Idle keep-alive connections are still waiting on their next request
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        self._conn.close()
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+async def serve(host, port, workers, db):
+    api = FarmQuestAPI(workers=workers, progress_store=open_progress_store(db))
+    server = await api.start(host, port)
+    print(f"FarmQuest API on http://{host}:{server.sockets[0].getsockname()[1]}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve FarmQuest crops, grading, assistant and certificates as JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="certificate worker processes (default: one per CPU)")
+    parser.add_argument("--db", default=os.environ.get("FARMQUEST_DB", "farmquest_progress.db"),
+                        help="progress database used to check certificate eligibility")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.db))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,17 @@
+import os
+import pandas as pd
 import streamlit as st
-from datetime import datetime, date
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
+from datetime import datetime
+from farmquest_analytics import open_event_log
+from farmquest_assistant import ask_assistant
+from farmquest_certificate import generate_certificate
+from farmquest_content import GUIDE_DONTS, GUIDE_DOS, GUIDE_STEPS, LANGUAGES, crop_data, language_pack
+from farmquest_irrigation import load_rainfall, plan_irrigation
+from farmquest_leaderboard import Leaderboard
+from farmquest_metrics import registry, start_exporters, timed, timed_function
+from farmquest_progress import open_progress_store
+from farmquest_questions import level_count, question_bank
+from farmquest_recommender import SOILS, recommend
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -14,6 +22,9 @@ st.set_page_config(
     layout="centered"
 )
 
+# Number of quiz levels to clear; FARMQUEST_LEVELS overrides, capped by the bank size
+LEVEL_COUNT = level_count()
+
 # -------------------------------------------------
 # SESSION STATE INIT
 # -------------------------------------------------
@@ -27,334 +38,315 @@ if "logged_in" not in st.session_state:
     reset_app()
 
 # -------------------------------------------------
-# CERTIFICATE FUNCTION
+# PROGRESS STORE
 # -------------------------------------------------
-def generate_certificate(username):
-    file_path = f"{username}_FarmQuest_Certificate.pdf"
-    doc = SimpleDocTemplate(file_path, pagesize=A4)
-    styles = getSampleStyleSheet()
-
-    title = ParagraphStyle("title", fontSize=24, alignment=TA_CENTER)
-    body = ParagraphStyle("body", fontSize=14, alignment=TA_CENTER)
-
-    content = [
-        Spacer(1, 40),
-        Paragraph("🌾 FarmQuest Certificate of Completion 🌾", title),
-        Spacer(1, 30),
-        Paragraph(
-            f"This certifies that <b>{username}</b><br/>"
-            "has successfully completed all 10 levels of<br/>"
-            "<b>FarmQuest – Learn Farming Like a Game</b>",
-            body
-        ),
-        Spacer(1, 20),
-        Paragraph(f"Date: {date.today().strftime('%d %B %Y')}", body),
-        Spacer(1, 30),
-        Paragraph("🏆 Title Awarded: <b>Smart Farmer</b>", body)
-    ]
-    doc.build(content)
-    return file_path
+@st.cache_resource
+def get_progress_store():
+    return open_progress_store(os.environ.get("FARMQUEST_DB", "farmquest_progress.db"))
+
+@st.cache_resource
+def get_leaderboard():
+    leaderboard = Leaderboard(get_progress_store())
+    leaderboard.sync()
+    return leaderboard
+
+@st.cache_resource
+def get_event_log():
+    return open_event_log(
+        os.environ.get("FARMQUEST_EVENTS", "farmquest_events"),
+        fmt=os.environ.get("FARMQUEST_EVENTS_FORMAT", "jsonl"),
+    )
+
+@st.cache_resource
+def start_metrics_exporters():
+    return start_exporters(
+        metrics_file=os.environ.get("FARMQUEST_METRICS_FILE"),
+        port=os.environ.get("FARMQUEST_METRICS_PORT"),
+    )
+
+progress_store = get_progress_store()
+leaderboard = get_leaderboard()
+events = get_event_log()
+start_metrics_exporters()
 
 # -------------------------------------------------
 # LOGIN PAGE
 # -------------------------------------------------
-if not st.session_state.logged_in:
-    st.title("🌾 FarmQuest")
-    name = st.text_input("👤 Enter your name")
-    if st.button("🚀 Start Game"):
-        if name.strip():
-            st.session_state.logged_in = True
-            st.session_state.username = name
-            st.balloons()
-            st.rerun()
-        else:
-            st.warning("Please enter your name")
-    st.stop()
+with timed("login_gate"):
+    if not st.session_state.logged_in:
+        st.title("🌾 FarmQuest")
+        name = st.text_input("👤 Enter your name")
+        if st.button("🚀 Start Game"):
+            if name.strip():
+                name = name.strip()
+                progress = progress_store.load(name)
+                if progress is None:
+                    progress = progress_store.save(name, 0, 1)
+                else:
+                    st.session_state.xp = progress.xp
+                    st.session_state.level = progress.level
+                st.session_state.logged_in = True
+                st.session_state.username = name
+                leaderboard.record(progress)
+                st.balloons()
+                st.rerun()
+            else:
+                st.warning("Please enter your name")
+        st.stop()
 
 # -------------------------------------------------
 # SIDEBAR SETTINGS
 # -------------------------------------------------
-st.sidebar.title("⚙️ Settings")
-st.sidebar.write("👤", st.session_state.username)
-st.sidebar.write("🌟 XP:", st.session_state.xp)
-st.sidebar.write("🏆 Level:", st.session_state.level)
+with timed("sidebar"):
+    st.sidebar.title("⚙️ Settings")
 
-if st.sidebar.button("🔁 Logout"):
-    reset_app()
-    st.rerun()
+    # Keyed so a correct quiz answer can refresh it without a full-app rerun
+    @st.fragment(key="player_stats")
+    def player_stats():
+        st.write("👤", st.session_state.username)
+        st.write("🌟 XP:", st.session_state.xp)
+        st.write("🏆 Level:", st.session_state.level)
+
+    with st.sidebar:
+        player_stats()
 
-language = st.sidebar.selectbox("🌐 Language / மொழி", ["English", "தமிழ்"])
-mode = st.sidebar.radio("🌓 Mode", ["Day Mode", "Night Mode"])
-hour = datetime.now().hour
-time_status = "☀️ Day Mode Active" if mode == "Day Mode" else "🌙 Night Mode Active"
-st.sidebar.info(time_status)
+    if st.sidebar.button("🔁 Logout"):
+        events.emit("logout", username=st.session_state.username,
+                    xp=st.session_state.xp, level=st.session_state.level)
+        reset_app()
+        st.rerun()
+
+    language = st.sidebar.selectbox("🌐 Language / மொழி", list(LANGUAGES))
+    mode = st.sidebar.radio("🌓 Mode", ["Day Mode", "Night Mode"])
+    hour = datetime.now().hour
+    time_status = "☀️ Day Mode Active" if mode == "Day Mode" else "🌙 Night Mode Active"
+    st.sidebar.info(time_status)
+
+    if os.environ.get("FARMQUEST_ADMIN") == "1":
+        with st.sidebar.expander("📈 Admin: section timings"):
+            st.dataframe(registry.summary(), hide_index=True)
+            st.download_button("⬇️ Prometheus metrics", registry.render_prometheus(), file_name="farmquest_metrics.prom")
 
 # -------------------------------------------------
 # LANGUAGE CONTENT
 # -------------------------------------------------
-if language == "English":
-    TITLE = "🌱 FarmQuest – Agriculture & Food Technology Guide"
-    SUBTITLE = "Crop • Water • Soil • Climate • Rural Development"
-    PROBLEM = [
-        "Farmers lack scientific crop information",
-        "Wrong crop selection causes loss",
-        "Improper irrigation wastes water",
-        "Beginners fear farming due to lack of guidance"
-    ]
-    SOLUTION = [
-        "One platform for agriculture & food technology",
-        "Crop-wise water, soil & climate info",
-        "Beginner-friendly farming guide",
-        "Supports rural development"
-    ]
-    GOV_SCHEMES = {
-        "PM-KISAN": [
-            "Direct Income Support: Provides financial assistance to small and marginal farmers, improving their purchasing power for essential agricultural inputs.",
-            "Direct Benefit Transfer (DBT): Funds are transferred directly to the bank accounts of beneficiaries, ensuring transparency and reducing corruption or leakage.",
-            "Assistance for Inputs: Helps farmers purchase seeds, fertilizers, and pesticides, especially during rising costs.",
-            "Reduced Debt Reliance: Decreases dependency on high-interest loans from informal money lenders.",
-            "Improved Cash Flow: The three-installment structure provides liquidity to farmers exactly when needed for cultivation cycles.",
-            "Comprehensive Coverage: Designed to cover all landholding farmers' families, supporting both agricultural needs and domestic expenses.",
-            "Source / Link: [PM-KISAN Official](https://share.google/jnXxl3n8oVdnkJe8I)"
-        ],
-        "PMFBY – Crop Insurance": [
-            "Comprehensive Coverage: Protects against pre-sowing to post-harvest losses, including localized risks and post-harvest damages from cyclones, floods, etc.",
-            "Low Premiums: Aims to increase penetration by keeping farmer premium shares low, subsidized by central and state governments.",
-            "Voluntary for Non-Loanee Farmers: Compulsory for farmers with crop loans but optional for others.",
-            "Technology Integration: Promotes using technology for yield estimation and efficient claim processing.",
-            "Income Stabilization: Supports farmers' income to keep them in farming, promotes credit flow, and ensures food security.",
-            "Source / Link: [PMFBY Official](https://share.google/jnXxl3n8oVdnkJe8I)"
-        ],
-        "PMKSY – Micro Irrigation": [
-            "High Financial Assistance: Small and marginal farmers can receive up to 100% subsidy (often capped per hectare), while large farmers receive up to 75% for micro-irrigation systems.",
-            "Water Conservation: Saves 30% to 50% more water compared to traditional flood irrigation methods.",
-            "Increased Productivity: Boosts crop yields by 20% to 50% through precise, direct-to-root water and nutrient delivery (fertigation).",
-            "Reduced Input Costs: Lowers expenditure on labor, fertilizers, and electricity for pumping.",
-            "Improved Crop Quality: Ensures consistent moisture levels, leading to higher quality produce and better pest/disease control.",
-            "Optimal Land Use: Highly suitable for diverse terrains and marginal lands.",
-            "Source / Link: [PMKSY Official](https://share.google/MRCbNEjHRKQJaugRJ)"
-        ],
-        "Organic Farming Support": [
-            "Environmental Sustainability: Reduces soil erosion, prevents groundwater pollution from chemical runoff, and promotes biodiversity by creating habitats for beneficial organisms.",
-            "Soil Health Enhancement: Continuous use of organic manure and compost increases soil fertility and long-term productivity.",
-            "Economic Benefits for Farmers: Organic farming reduces dependence on expensive synthetic inputs, leading to lower cultivation costs and higher income due to premium market prices.",
-            "Healthier Food Production: Produces food free from harmful synthetic pesticide residues, often with higher nutritional value.",
-            "Climate Change Mitigation: Organic methods typically require less energy and contribute to higher carbon sequestration in the soil.",
-            "Source / Link: [TNAU Organic Farming](https://share.google/LcCgauk8WZlMffh6V)"
-        ],
-        "Farmer Training (TNAU)": [
-            "Financial & Resource Accessibility: Eliminates cost barriers, making expert knowledge available to small and marginal farmers. Includes training on accessing government subsidies for machinery.",
-            "Increased Yields and Quality: Covers high-yield techniques, integrated pest management (IPM), and improved irrigation, leading to higher productivity and better produce quality.",
-            "Adoption of Sustainable Practices: Teaches efficient resource use, reduces reliance on chemical pesticides and fertilizers, improves soil health, and protects the ecosystem.",
-            "Source / Link: [TNAU Agritech Portal](https://share.google/sek8t8VcUSNS31fRE)"
-        ]
-    }
-
-else:
-    TITLE = "🌱 FarmQuest – வேளாண்மை மற்றும் உணவு தொழில்நுட்ப வழிகாட்டி"
-    SUBTITLE = "பயிர் • நீர் • மண் • காலநிலை • ஊரக வளர்ச்சி"
-    PROBLEM = [
-        "விவசாயிகளுக்கு அறிவியல் தகவல் குறைவு",
-        "தவறான பயிர் தேர்வு காரணமாக இழப்பு",
-        "நீர் வீணாகிறது",
-        "தொடக்க நிலை விவசாயிகளுக்கு வழிகாட்டல் இல்லை"
-    ]
-    SOLUTION = [
-        "ஒருங்கிணைந்த வேளாண்மை தளம்",
-        "பயிர் வாரியான தகவல்கள்",
-        "தொடக்க நிலை விவசாயிகளுக்கு வழிகாட்டி",
-        "ஊரக வளர்ச்சி ஆதரவு"
-    ]
-GOV_SCHEMES = {
-    "PM-KISAN": [
-        "நேரடி வருமான உதவி: சிறிய மற்றும் புறநகர் விவசாயிகளுக்கு நிதி ஆதரவு, விதைகள், உரம், பூச்சிக் கொல்லிகள் வாங்க உதவுகிறது.",
-        "நேரடி நன்மை பரிமாற்றம் (DBT): நிதி நேரடியாக வங்கி கணக்குகளில் செலுத்தப்படுகிறது, வெளிப்படைத்தன்மை மற்றும் ஊழலை குறைக்கிறது.",
-        "வளங்களுக்கான உதவி: விதை, உரம், பூச்சிக் கொல்லிகள் வாங்க உதவி.",
-        "கடன் சார்பு குறைவு: உயர்வான வட்டி கடன் தேவையில்லை.",
-        "பணம் திரும்ப பெறுதல்: மூன்று நிலை தொகை விவசாயிகளுக்கு செறிவான நேரத்தில் கிடைக்கும்.",
-        "முழுமையான வரம்பு: எல்லா விவசாயி குடும்பங்களையும் காப்பு செய்யும்.",
-        "மூல / இணைப்பு: [PM-KISAN அதிகாரப்பூர்வம்](https://share.google/jnXxl3n8oVdnkJe8I)"
-    ],
-    "PMFBY – பயிர் காப்பீடு": [
-        "முழுமையான காப்பீடு: விதைப்பு முதல் அறுவடை வரை, புயல், வெள்ளம் போன்ற இயற்கை நிபந்தனைகளில் ஏற்படும் இழப்புகளையும் பாதுகாக்கிறது.",
-        "குறைந்த காப்பீட்டு தொகை: விவசாயி பங்கு குறைவு, மைய அரசு மற்றும் மாநில அரசு மானியம்.",
-        "தன்னிச்சையான விவசாயிகளுக்கு விருப்ப: கடன் பெற்ற விவசாயிகளுக்கு கட்டாயம், மற்றவர்கள் விருப்பம்.",
-        "தொழில்நுட்ப ஒருங்கிணைப்பு: விளைச்சல் மதிப்பீடு மற்றும் விரைவான கோரிக்கை செயலாக்கத்திற்கு தொழில்நுட்பம் பயன்படுத்தப்படுகிறது.",
-        "வருமான நிலைத்தன்மை: விவசாயிகளை நிலைத்த வேளாண்மையில் வைக்கும், கடன் செல்லும் வழியை ஊக்குவிக்கும், உணவு பாதுகாப்பை உறுதி செய்கிறது.",
-        "மூல / இணைப்பு: [PMFBY அதிகாரப்பூர்வம்](https://share.google/jnXxl3n8oVdnkJe8I)"
-    ],
-    "PMKSY – துளி நீர் பாசனம்": [
-        "உயர் நிதி உதவி: சிறிய மற்றும் புறநகர் விவசாயிகள் 100% மானியம் பெறலாம்; பெரிய விவசாயிகள் 75% வரை பெறுவர்.",
-        "நீர் சேமிப்பு: வழக்கமான வெள்ளம் பாசன முறைசெயலுக்கு 30–50% அதிக சேமிப்பு.",
-        "உற்பத்தி அதிகரிப்பு: செடி வேரில் நேரடியாக நீர் மற்றும் உரங்களை அளிப்பதால் 20–50% விளைச்சல் அதிகரிப்பு.",
-        "செலவுகள் குறைவு: உழவு, உரம் மற்றும் மின்சாரம் செலவைக் குறைக்கும்.",
-        "பயிர் தரம் மேம்பாடு: நிலையான ஈரப்பதம், உயர் தரமுள்ள விளைச்சல், பூச்சி/நோய் கட்டுப்பாடு.",
-        "சரியான நிலப்பயன்பாடு: பல்வேறு நிலத்துக்கு ஏற்றது, எல்லா நிலங்களுக்கும்.",
-        "மூல / இணைப்பு: [PMKSY அதிகாரப்பூர்வம்](https://share.google/MRCbNEjHRKQJaugRJ)"
-    ],
-    "இயற்கை வேளாண்மை": [
-        "சுற்றுச்சூழல் நிலைத்தன்மை: மண் அடர்த்தி குறைவு, இரசாயன நீர் மாசுபாடு குறைவு, பயனுள்ள உயிரினங்களுக்கு வாழிடம்.",
-        "மண் வளம் மேம்பாடு: உரம் மற்றும் கம்போஸ்ட் பயன்படுத்தல் மூலம் நீண்டகால விளைச்சல்.",
-        "விவசாயிகளுக்கு பொருளாதார நன்மை: குறைந்த செயற்கை செலவு, உயர் விலை சந்தை மூலம் அதிக வருமானம்.",
-        "ஆரோக்கியமான உணவு: இரசாயன தடுப்பு இல்லாமல், அதிக ஊட்டச்சத்து கொண்ட உணவு.",
-        "காலநிலை மாற்ற தடுப்பு: குறைந்த எரிசக்தி பயன்படுத்தல், நிலத்தில் கார்பன் அதிகம் சேர்க்கும்.",
-        "மூல / இணைப்பு: [TNAU Organic Farming](https://share.google/LcCgauk8WZlMffh6V)"
-    ],
-    "TNAU பயிற்சிகள்": [
-        "நிதி & வளங்கள்: சிறிய மற்றும் புறநகர் விவசாயிகளுக்கு விலை தடைகளை நீக்குகிறது, இயந்திர உதவி மற்றும் மானியம் பயன்படுத்த பயிற்சி.",
-        "உயர் விளைச்சல் & தரம்: சிறந்த விதை தேர்வு, ஒருங்கிணைந்த பூச்சிக் கட்டுப்பாடு (IPM), மேம்பட்ட பாசனம் மூலம் உயர் விளைச்சல்.",
-        "நிலையான நடைமுறை: வளங்களை திறம்பட பயன்படுத்துதல், இரசாயன பூச்சி/உரம் குறைப்பு, மண் நலம் மேம்பாடு, சுற்றுச்சூழல் பாதுகாப்பு.",
-        "மூல / இணைப்பு: [TNAU Agritech Portal](https://share.google/sek8t8VcUSNS31fRE)"
-    ]
-}
-
+with timed("language_content"):
+    # Packs are built once per process and shared by every session
+    pack = language_pack(language)
 
 # -------------------------------------------------
 # TITLE
 # -------------------------------------------------
-st.title(TITLE)
-st.subheader(SUBTITLE)
+st.title(pack.title)
+st.subheader(pack.subtitle)
 st.divider()
 st.header("🌾 Welcome")
 st.write("Farming is the backbone of our nation 🇮🇳. Even beginners can become successful farmers with the right guidance.")
 
 # -------------------------------------------------
-# TABS
+# PAGES
 # -------------------------------------------------
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["🎮 Game Levels", "🌾 Crop Info", "📘 Guide + AI Chatbot", "📜 Knowledge & Certificate"]
-)
+# Only the selected page's function runs on a rerun, and the quiz, crop lookup
+# and chatbot are fragments so their widgets rerun just their own subtree.
 
 # -------------------------
-# TAB 1: GAME LEVELS
+# PAGE 1: GAME LEVELS
 # -------------------------
-levels = {
-    1: ("What is farming?", ["Cooking", "Growing crops", "Mining"], "Growing crops"),
-    2: ("What do crops need?", ["Plastic", "Water & Soil", "Stone"], "Water & Soil"),
-    3: ("Which saves water?", ["Flood irrigation", "Drip irrigation", "Over watering"], "Drip irrigation"),
-    4: ("Best soil for crops?", ["Sandy", "Clay", "Loamy"], "Loamy"),
-    5: ("Which is organic fertilizer?", ["Urea", "DAP", "Compost"], "Compost"),
-    6: ("Kharif crop?", ["Wheat", "Rice", "Mustard"], "Rice"),
-    7: ("Natural pesticide?", ["Neem oil", "Chemical spray", "Plastic"], "Neem oil"),
-    8: ("Why rotate crops?", ["Increase pests", "Improve soil", "Waste land"], "Improve soil"),
-    9: ("Modern irrigation?", ["Bucket", "Canal", "Drip"], "Drip"),
-    10: ("Eco-friendly farming?", ["Organic farming", "Burning crops", "Chemicals"], "Organic farming"),
-}
-
-with tab1:
+def submit_answer(answer_key, question):
+    # Read the radio from session state so a change made just before the click counts
+    correct = st.session_state[answer_key] == question.answer
+    events.emit(
+        "quiz_submit", username=st.session_state.username, level=st.session_state.level,
+        question_id=question.id, topic=question.topic, language=language, correct=correct,
+    )
+    if correct:
+        st.session_state.xp += 20
+        st.session_state.level += 1
+        st.session_state.quiz_feedback = ("success", "Correct! +20 XP 🎉")
+        progress = progress_store.save(
+            st.session_state.username, st.session_state.xp, st.session_state.level,
+            completed=st.session_state.level > LEVEL_COUNT
+        )
+        leaderboard.record(progress)
+        st.rerun(scope=["quiz", "player_stats"])
+    else:
+        st.session_state.quiz_feedback = ("error", "❌ Wrong answer. Try again!")
+
+@st.fragment(key="quiz")
+@timed_function("fragment:quiz")
+def quiz():
     st.header(f"🌱 Level {st.session_state.level}")
-    if st.session_state.level <= 10:
-        q, options, correct = levels[st.session_state.level]
-        ans = st.radio(q, options, key=f"lvl{st.session_state.level}")
-        if st.button("✅ Submit"):
-            if ans == correct:
-                st.success("Correct! +20 XP 🎉")
-                st.session_state.xp += 20
-                st.session_state.level += 1
-                st.rerun()
-            else:
-                st.error("❌ Wrong answer. Try again!")
+    feedback = st.session_state.pop("quiz_feedback", None)
+    if feedback:
+        getattr(st, feedback[0])(feedback[1])
+
+    if st.session_state.level <= LEVEL_COUNT:
+        # Each player gets their own non-repeating draw from the question bank
+        question = question_bank(language).level(st.session_state.username, st.session_state.level, LEVEL_COUNT)
+        answer_key = f"lvl{st.session_state.level}"
+        st.radio(question.question, question.options, key=answer_key)
+        st.button("✅ Submit", on_click=submit_answer, args=(answer_key, question))
     else:
         st.success("🎉 All levels completed!")
 
+def game_levels_page():
+    quiz()
+
 # -------------------------
-# TAB 2: FULL CROP DATA
+# PAGE 2: FULL CROP DATA
 # -------------------------
-crop_data = {
-    "Tomato": {"water": "600–800 mm", "soil": "Loamy, well-drained", "climate": "20–30°C", "food": "Seeds, pulp (sauce, ketchup)"},
-    "Brinjal": {"water": "500–700 mm", "soil": "Sandy loam", "climate": "22–35°C", "food": "Seeds"},
-    "Chilli": {"water": "600–900 mm", "soil": "Well-drained loamy", "climate": "20–30°C", "food": "Dry chilli powder, seeds"},
-    "Onion": {"water": "350–550 mm", "soil": "Sandy loam", "climate": "13–25°C", "food": "Onion skins (manure)"},
-    "Ladies Finger": {"water": "500–800 mm", "soil": "Loamy", "climate": "22–35°C", "food": "Seeds"},
-    "Spinach": {"water": "300–500 mm", "soil": "Fertile loamy", "climate": "15–25°C", "food": "Compost material"},
-    "Cucumber": {"water": "700–1200 mm", "soil": "Sandy loam", "climate": "18–30°C", "food": "Seeds"},
-    "Carrot": {"water": "350–550 mm", "soil": "Sandy soil", "climate": "15–25°C", "food": "Leaves (compost)"},
-    "Coriander": {"water": "400–600 mm", "soil": "Loamy", "climate": "18–28°C", "food": "Seeds (spice)"},
-    "Groundnut": {"water": "500–700 mm", "soil": "Sandy loam, well-drained", "climate": "20–30°C", "food": "Groundnut cake (cattle feed), shells"},
-    "Mustard": {"water": "350–500 mm", "soil": "Loamy soil", "climate": "10–25°C", "food": "Mustard cake, leaves (vegetable)"},
-    "Sunflower": {"water": "500–800 mm", "soil": "Loamy, well-drained", "climate": "20–30°C", "food": "Sunflower cake, husk"},
-    "Sesame": {"water": "300–500 mm", "soil": "Sandy loam", "climate": "25–35°C", "food": "Sesame cake, stalks (fuel)"},
-    "Soybean": {"water": "500–700 mm", "soil": "Loamy soil", "climate": "20–30°C", "food": "Soy cake, soy meal"},
-    "Castor": {"water": "400–600 mm", "soil": "Sandy loam", "climate": "20–35°C", "food": "Castor cake (manure), stems"},
-    "Linseed": {"water": "450–650 mm", "soil": "Loamy", "climate": "10–25°C", "food": "Linseed cake, fiber"},
-    "Safflower": {"water": "400–600 mm", "soil": "Loamy, well-drained", "climate": "15–30°C", "food": "Safflower cake, petals (dye)"},
-    "Niger": {"water": "500–800 mm", "soil": "Loamy", "climate": "20–30°C", "food": "Niger cake, bird feed"},
-    "Coconut": {"water": "1300–2300 mm", "soil": "Sandy loam", "climate": "20–35°C", "food": "Copra, coir, shell charcoal"}
-}
-
-with tab2:
+@st.fragment
+@timed_function("fragment:crop_lookup")
+def crop_lookup():
     crop = st.selectbox("Select Crop", list(crop_data.keys()))
     st.subheader("💧 Water Requirement"); st.write(crop_data[crop]["water"])
     st.subheader("🌱 Soil Requirement"); st.write(crop_data[crop]["soil"])
     st.subheader("☀️ Climate Requirement"); st.write(crop_data[crop]["climate"])
     st.subheader("🏭 By-product / Food Application"); st.write(crop_data[crop]["food"])
 
+@st.fragment
+@timed_function("fragment:crop_recommender")
+def crop_recommender():
+    st.subheader("🧭 Crop Recommender")
+    c1, c2, c3 = st.columns(3)
+    rainfall = c1.number_input("Seasonal rainfall (mm)", 0, 5000, 600, step=50)
+    temperature = c2.number_input("Average temperature (°C)", 0, 50, 25)
+    soil = c3.selectbox("Soil type", SOILS)
+    st.dataframe(recommend(rainfall, temperature, soil, top_n=5), hide_index=True)
+
+@st.fragment
+@timed_function("fragment:irrigation_planner")
+def irrigation_planner():
+    st.subheader("💧 Irrigation Planner")
+    c1, c2, c3 = st.columns(3)
+    crop = c1.selectbox("Crop", list(crop_data.keys()), key="irrigation_crop")
+    area = c2.number_input("Plot area (ha)", 0.1, 100.0, 1.0, step=0.1)
+    sown_on = c3.date_input("Sown on", value=None)
+    rainfall_csv = st.file_uploader("Daily rainfall CSV (date, rainfall in mm)", type="csv")
+    if rainfall_csv is None:
+        st.info("Upload a season of daily rainfall to compare drip and flood irrigation")
+        return
+
+    plot = {"crop": [crop], "area": [area]}
+    if sown_on:
+        plot["sown_on"] = [sown_on]
+    try:
+        totals, weekly = plan_irrigation(pd.DataFrame(plot), load_rainfall(rainfall_csv))
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    row = totals.iloc[0]
+    if row.coverage < 1:
+        st.warning(
+            f"⚠️ The rainfall file covers only {row.coverage:.0%} of this {crop} season, "
+            "so these totals understate the water it needs"
+        )
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Drip (m³)", f"{row.drip_m3:,.0f}")
+    m2.metric("Flood (m³)", f"{row.flood_m3:,.0f}")
+    m3.metric("Saved with drip (m³)", f"{row.saved_m3:,.0f}")
+    st.bar_chart(weekly.set_index("week")[["drip_m3", "flood_m3"]], stack=False)
+
+def crop_info_page():
+    crop_lookup()
+    st.divider()
+    crop_recommender()
+    st.divider()
+    irrigation_planner()
 
 # -------------------------
-# TAB 3: GUIDE + AI CHATBOT
+# PAGE 3: GUIDE + AI CHATBOT
 # -------------------------
-with tab3:
-    st.subheader("📘 Beginner Guide")
-    st.write("🌱 Step 1: Understand soil & water")
-    st.write("🌾 Step 2: Select suitable crops")
-    st.write("💧 Step 3: Efficient irrigation")
-    st.write("🌿 Step 4: Prefer organic methods")
-    st.write("🧺 Step 5: Harvest & store properly")
-    st.subheader("✅ Do’s"); st.write("• Soil testing\n• Crop rotation\n• Use organic manure")
-    st.subheader("❌ Don’ts"); st.write("• Don't waste water\n• Don't overuse chemicals\n• Don't lose confidence")
-
+@st.fragment
+@timed_function("fragment:assistant")
+def assistant():
     st.subheader("🤖 Smart Farming AI Assistant")
     question = st.text_input("💬 Ask your farming question")
 
-    def farming_ai(q):
-        q_lower = q.lower()
-        if "rice" in q_lower: return "🌾 Rice needs clay soil, high water, warm climate."
-        if "wheat" in q_lower: return "🌾 Wheat grows well in loamy soil, moderate water, cool climate."
-        if "millet" in q_lower: return "🌾 Millets require low water, dry regions."
-        if "soil" in q_lower: return "🌍 Healthy soil contains nutrients, organic matter, and good drainage."
-        if "water" in q_lower or "irrigation" in q_lower: return "💧 Drip irrigation saves water and improves yield."
-        if "fertilizer" in q_lower: return "🌱 Organic fertilizers improve soil health."
-        if "pest" in q_lower or "insect" in q_lower: return "🐛 Neem oil is natural & safe."
-        if "disease" in q_lower: return "🦠 Crop rotation & healthy soil prevent diseases."
-        if "scheme" in q_lower or "government" in q_lower:
-            text = "🌾 **Government Schemes:**\n"
-            for scheme, points in GOV_SCHEMES.items():
-                text += f"• **{scheme}**\n"
-                for p in points:
-                    text += f"  - {p}\n"
-            return text
-        return "🌱 Tip: Choose crops by soil/climate, use organic fertilizer, save water, rotate crops, check gov schemes."
-
     if st.button("💬 Ask AI"):
-        if question.strip(): st.markdown(farming_ai(question))
+        if question.strip():
+            answer = ask_assistant(question, language)
+            events.emit(
+                "assistant_query", username=st.session_state.username, language=language,
+                query=question, source=answer.source, score=round(answer.score, 3),
+            )
+            st.markdown(answer.text)
         else: st.warning("Type a question")
 
+def guide_page():
+    st.subheader("📘 Beginner Guide")
+    for step in GUIDE_STEPS:
+        st.write(step)
+    st.subheader("✅ Do’s"); st.write("\n".join("• " + d for d in GUIDE_DOS))
+    st.subheader("❌ Don’ts"); st.write("\n".join("• " + d for d in GUIDE_DONTS))
+
+    assistant()
+
 # -------------------------
-# TAB 4: KNOWLEDGE & CERTIFICATE
+# PAGE 4: KNOWLEDGE & CERTIFICATE
 # -------------------------
-with tab4:
+def knowledge_page():
     st.header("❗ Problems")
-    for p in PROBLEM:
-        st.write("•", p)
-    
+    st.markdown(pack.problems_md)
+
     st.header("🤝 Government Schemes")
-    for scheme, points in GOV_SCHEMES.items():
-        st.subheader(scheme)
-        for p in points:
-            if p.startswith("மூல / இணைப்பு") or p.startswith("Link:"):
-                # Display link as clickable
-                link_text = p.split(":")[-1].strip()
-                st.markdown(f"[🔗 {link_text}]({link_text})")
-            else:
-                st.write("•", p)
+    st.markdown(pack.schemes_md)
 
     st.divider()
-    if st.session_state.level > 10:
-        if st.button("📄 Download Certificate"):
-            path = generate_certificate(st.session_state.username)
-            with open(path, "rb") as f:
-                st.download_button("⬇️ Download PDF", f, file_name="FarmQuest_Certificate.pdf")
+    if st.session_state.level > LEVEL_COUNT:
+        # Printed with the stored completion date, as the cohort export does, so
+        # the PDF is stable across days and its cache entry keeps hitting
+        progress = progress_store.load(st.session_state.username)
+        completed_on = (
+            datetime.fromtimestamp(progress.completed_at).date()
+            if progress and progress.completed_at else None
+        )
+        pdf = generate_certificate(st.session_state.username, completed_on, level_count=LEVEL_COUNT)
+        st.download_button(
+            "📄 Download Certificate", pdf, file_name="FarmQuest_Certificate.pdf", mime="application/pdf",
+            on_click=events.emit, args=("certificate_download",),
+            kwargs={"username": st.session_state.username, "level_count": LEVEL_COUNT},
+        )
     else:
-        st.warning("❌ Complete all 10 levels to unlock certificate")
+        st.warning(f"❌ Complete all {LEVEL_COUNT} levels to unlock certificate")
+
+# -------------------------
+# PAGE 5: LEADERBOARD
+# -------------------------
+def leaderboard_page():
+    # Snapshot is shared by all sessions and refreshed from the store every few seconds
+    board = leaderboard.snapshot(10)
+    st.caption(f"👥 {board['players']} players")
 
+    st.subheader("🌟 Top XP")
+    st.table([{"Player": name, "XP": xp} for name, xp in board["xp"]])
 
+    st.subheader("⏱️ Fastest to finish all levels")
+    if board["time"]:
+        st.table([
+            {"Player": name, "Time": f"{int(seconds // 60)}m {int(seconds % 60)}s"}
+            for name, seconds in board["time"]
+        ])
+    else:
+        st.info("Nobody has finished all levels yet")
+
+    rank = leaderboard.rank_xp(st.session_state.username)
+    if rank:
+        st.write(f"🏅 Your XP rank: #{rank}")
+    rank = leaderboard.rank_time(st.session_state.username)
+    if rank:
+        st.write(f"⏱️ Your finish-time rank: #{rank}")
+
+page = st.navigation(
+    [
+        st.Page(game_levels_page, title="Game Levels", icon="🎮", url_path="game", default=True),
+        st.Page(crop_info_page, title="Crop Info", icon="🌾", url_path="crops"),
+        st.Page(guide_page, title="Guide + AI Chatbot", icon="📘", url_path="guide"),
+        st.Page(knowledge_page, title="Knowledge & Certificate", icon="📜", url_path="knowledge"),
+        st.Page(leaderboard_page, title="Leaderboard", icon="🏆", url_path="leaderboard"),
+    ],
+    position="top",
+)
+with timed(f"page:{page.title}"):
+    page.run()
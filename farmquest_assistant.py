@@ -0,0 +1,209 @@
+import re
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from farmquest_content import GUIDE_DONTS, GUIDE_DOS, GUIDE_STEPS, crop_data, language_pack
+from farmquest_metrics import timed_function
+
+# -------------------------------------------------
+# KNOWLEDGE BASE
+# -------------------------------------------------
+FALLBACK = "🌱 Tip: Choose crops by soil/climate, use organic fertilizer, save water, rotate crops, check gov schemes."
+
+# Short answers kept from the original keyword assistant, indexed by their keywords
+TIPS = [
+    ("rice paddy", "🌾 Rice needs clay soil, high water, warm climate."),
+    ("wheat", "🌾 Wheat grows well in loamy soil, moderate water, cool climate."),
+    ("millet ragi bajra", "🌾 Millets require low water, dry regions."),
+    ("soil", "🌍 Healthy soil contains nutrients, organic matter, and good drainage."),
+    ("water irrigation", "💧 Drip irrigation saves water and improves yield."),
+    ("fertilizer fertiliser manure", "🌱 Organic fertilizers improve soil health."),
+    ("pest insect", "🐛 Neem oil is natural & safe."),
+    ("disease rotation", "🦠 Crop rotation & healthy soil prevent diseases."),
+]
+SCHEME_KEYWORDS = "scheme government govt yojana subsidy திட்டம் திட்டங்கள் அரசு"
+GUIDE_KEYWORDS = "guide beginner start step dos donts"
+
+# Every question here is about farming, so those words carry no intent either
+STOPWORDS = frozenset(
+    "a about an and are best can crop do does for from good grow how i in is it me my of on or should "
+    "tell the to what when where which who why with you your "
+    "farm farmer farming agriculture support".split()
+)
+TOKEN_RE = re.compile(r"[\w\u0B80-\u0BFF]+")
+ACRONYM_RE = re.compile(r"\b[A-Z][A-Z0-9]+(?:-[A-Z0-9]+)*\b")
+
+# Questions scoring below this cosine similarity get the general tip
+MIN_SCORE = 0.12
+
+# phrases: keyword phrases that route to the document; defaults to each keyword on its own
+Document = namedtuple("Document", "source keywords text answer phrases", defaults=(None,))
+Answer = namedtuple("Answer", "text score source")
+
+
+def tokenize(text):
+    tokens = []
+    for tok in TOKEN_RE.findall(text.lower()):
+        # Cheap plural folding so "pests" and "schemes" hit the singular keywords
+        if tok.isascii() and len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        if tok not in STOPWORDS:
+            tokens.append(tok)
+    return tokens
+
+
+def scheme_markdown(schemes):
+    lines = ["🌾 **Government Schemes:**"]
+    for scheme, points in schemes.items():
+        lines.append(f"• **{scheme}**")
+        lines.extend(f"  - {p}" for p in points)
+    return "\n".join(lines) + "\n"
+
+
+def build_documents(language):
+    # Order matters: an exact keyword hit goes to the first document that has
+    # it, so crop names come before the general tips and the tips keep the
+    # original assistant's precedence. Schemes only route on their whole name
+    # or an acronym such as PMFBY, since words like "micro" or "training" are
+    # too generic to pick one scheme
+    schemes = language_pack(language).gov_schemes
+    docs = []
+    for name, info in crop_data.items():
+        answer = (
+            f"🌾 **{name}** — 💧 {info['water']} • 🌱 {info['soil']} • "
+            f"☀️ {info['climate']} • 🏭 {info['food']}"
+        )
+        docs.append(Document(f"crop:{name}", name, " ".join(info.values()), answer))
+
+    docs += [Document("tip", keywords, "", answer) for keywords, answer in TIPS]
+    for scheme, points in schemes.items():
+        docs.append(Document(
+            f"scheme:{scheme}", scheme, " ".join(points), scheme_markdown({scheme: points}),
+            phrases=[scheme, *ACRONYM_RE.findall(scheme)],
+        ))
+    docs.append(Document("schemes", SCHEME_KEYWORDS, "", scheme_markdown(schemes)))
+
+    guide = "\n".join(
+        ["📘 **Beginner Guide**"] + GUIDE_STEPS
+        + ["✅ " + d for d in GUIDE_DOS] + ["❌ " + d for d in GUIDE_DONTS]
+    )
+    docs.append(Document("guide", GUIDE_KEYWORDS, " ".join(GUIDE_STEPS + GUIDE_DOS + GUIDE_DONTS), guide))
+    # The question bank is deliberately left out: the index is a dense
+    # docs x vocab matrix per language, and a large bank would undo its lazy,
+    # memory-mapped loading in every process that imports the assistant
+    return docs
+
+
+# -------------------------------------------------
+# TF-IDF INDEX
+# -------------------------------------------------
+class AssistantEngine:
+    def __init__(self, documents, cache_size=2048):
+        self.documents = documents
+        self.vocab = {}
+
+        # Keywords count twice so a short intent beats an incidental mention
+        doc_tokens = [tokenize(d.keywords) * 2 + tokenize(d.text) for d in documents]
+        for tokens in doc_tokens:
+            for tok in tokens:
+                self.vocab.setdefault(tok, len(self.vocab))
+
+        # Keyword phrases by their first token, in document order; a phrase
+        # routes only when the question has all of its tokens
+        self.routes = {}
+        for doc_id, doc in enumerate(documents):
+            phrases = doc.phrases or tokenize(doc.keywords)
+            for phrase in dict.fromkeys(tuple(dict.fromkeys(tokenize(p))) for p in phrases):
+                if phrase:
+                    self.routes.setdefault(phrase[0], []).append((doc_id, phrase))
+
+        counts = np.zeros((len(documents), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(doc_tokens):
+            np.add.at(counts[row], [self.vocab[t] for t in tokens], 1)
+
+        df = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+        weights = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0) * self.idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        self.matrix = (weights / np.maximum(norms, 1e-9)).astype(np.float32)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _query_matrix(self, token_lists):
+        queries = np.zeros((len(token_lists), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(token_lists):
+            ids = [self.vocab[t] for t in tokens if t in self.vocab]
+            if ids:
+                np.add.at(queries[row], ids, 1)
+        queries = np.where(queries > 0, 1 + np.log(np.maximum(queries, 1)), 0) * self.idf
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        return queries / np.maximum(norms, 1e-9)
+
+    def _score(self, keys):
+        token_lists = [key.split() for key in keys]
+        scores = self._query_matrix(token_lists) @ self.matrix.T
+        best = scores.argmax(axis=1)
+        answers = []
+        for row, doc_id in enumerate(best):
+            # Exact keyword hits beat similarity: most hits wins, then document order
+            tokens = set(token_lists[row])
+            routed = Counter()
+            for tok in tokens:
+                for d, phrase in self.routes.get(tok, ()):
+                    if tokens.issuperset(phrase):
+                        routed[d] += len(phrase)
+            if routed:
+                doc_id = min(routed, key=lambda d: (-routed[d], d))
+            score = float(scores[row, doc_id])
+            if not routed and score < MIN_SCORE:
+                answers.append(Answer(FALLBACK, score, None))
+            else:
+                doc = self.documents[doc_id]
+                answers.append(Answer(doc.answer, score, doc.source))
+        return answers
+
+    def ask_many(self, questions):
+        keys = [" ".join(tokenize(q)) for q in questions]
+        results = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[key] = self._cache[key]
+
+        missing = list(dict.fromkeys(k for k in keys if k not in results))
+        if missing:
+            scored = dict(zip(missing, self._score(missing)))
+            results.update(scored)
+            with self._lock:
+                self._cache.update(scored)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [results[key] for key in keys]
+
+    def ask(self, question):
+        return self.ask_many([question])[0]
+
+
+@lru_cache(maxsize=None)
+def get_engine(language="English"):
+    return AssistantEngine(build_documents(language))
+
+
+@timed_function("farming_ai")
+def ask_assistant(q, language="English"):
+    return get_engine(language).ask(q)
+
+
+def farming_ai(q, language="English"):
+    return ask_assistant(q, language).text
+
+
+@timed_function("answer_many")
+def answer_many(questions, language="English"):
+    return [a.text for a in get_engine(language).ask_many(questions)]
@@ -0,0 +1,99 @@
+import copy
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+from farmquest_metrics import timed_function
+
+# -------------------------------------------------
+# CERTIFICATE TEMPLATE
+# -------------------------------------------------
+# Styles and the static flowables are built once per process. Each render
+# works on shallow copies, because platypus stores layout state on the
+# flowable instances while building and sessions render from many threads.
+@lru_cache(maxsize=1)
+def certificate_template():
+    title = ParagraphStyle("title", fontSize=24, alignment=TA_CENTER)
+    body = ParagraphStyle("body", fontSize=14, alignment=TA_CENTER)
+    return {
+        "styles": {"title": title, "body": body},
+        "header": [
+            Spacer(1, 40),
+            Paragraph("🌾 FarmQuest Certificate of Completion 🌾", title),
+            Spacer(1, 30),
+        ],
+        "footer": [
+            Spacer(1, 30),
+            Paragraph("🏆 Title Awarded: <b>Smart Farmer</b>", body),
+        ],
+    }
+
+
+@timed_function("render_certificate")
+def render_certificate(username, completed_on, level_count=10):
+    template = certificate_template()
+    body = template["styles"]["body"]
+
+    content = [copy.copy(f) for f in template["header"]]
+    content += [
+        Paragraph(
+            f"This certifies that <b>{escape(username)}</b><br/>"
+            f"has successfully completed all {level_count} levels of<br/>"
+            "<b>FarmQuest – Learn Farming Like a Game</b>",
+            body
+        ),
+        Spacer(1, 20),
+        Paragraph(f"Date: {completed_on.strftime('%d %B %Y')}", body),
+    ]
+    content += [copy.copy(f) for f in template["footer"]]
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(content)
+    return buffer.getvalue()
+
+
+# -------------------------------------------------
+# RENDERED CERTIFICATE CACHE
+# -------------------------------------------------
+class CertificateCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username, completed_on, level_count=10):
+        key = (username, completed_on, level_count)
+        with self._lock:
+            pdf = self._items.get(key)
+            if pdf is not None:
+                self._items.move_to_end(key)
+                return pdf
+
+        # Render outside the lock so one slow build does not stall other sessions
+        pdf = render_certificate(username, completed_on, level_count)
+        with self._lock:
+            self._items[key] = pdf
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return pdf
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+certificate_cache = CertificateCache()
+
+
+@timed_function("generate_certificate")
+def generate_certificate(username, completed_on=None, level_count=10):
+    return certificate_cache.get(username, completed_on or date.today(), level_count)
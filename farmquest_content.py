@@ -0,0 +1,103 @@
+import json
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+# -------------------------------------------------
+# CROP DATA
+# -------------------------------------------------
+crop_data = {
+    "Tomato": {"water": "600–800 mm", "soil": "Loamy, well-drained", "climate": "20–30°C", "food": "Seeds, pulp (sauce, ketchup)"},
+    "Brinjal": {"water": "500–700 mm", "soil": "Sandy loam", "climate": "22–35°C", "food": "Seeds"},
+    "Chilli": {"water": "600–900 mm", "soil": "Well-drained loamy", "climate": "20–30°C", "food": "Dry chilli powder, seeds"},
+    "Onion": {"water": "350–550 mm", "soil": "Sandy loam", "climate": "13–25°C", "food": "Onion skins (manure)"},
+    "Ladies Finger": {"water": "500–800 mm", "soil": "Loamy", "climate": "22–35°C", "food": "Seeds"},
+    "Spinach": {"water": "300–500 mm", "soil": "Fertile loamy", "climate": "15–25°C", "food": "Compost material"},
+    "Cucumber": {"water": "700–1200 mm", "soil": "Sandy loam", "climate": "18–30°C", "food": "Seeds"},
+    "Carrot": {"water": "350–550 mm", "soil": "Sandy soil", "climate": "15–25°C", "food": "Leaves (compost)"},
+    "Coriander": {"water": "400–600 mm", "soil": "Loamy", "climate": "18–28°C", "food": "Seeds (spice)"},
+    "Groundnut": {"water": "500–700 mm", "soil": "Sandy loam, well-drained", "climate": "20–30°C", "food": "Groundnut cake (cattle feed), shells"},
+    "Mustard": {"water": "350–500 mm", "soil": "Loamy soil", "climate": "10–25°C", "food": "Mustard cake, leaves (vegetable)"},
+    "Sunflower": {"water": "500–800 mm", "soil": "Loamy, well-drained", "climate": "20–30°C", "food": "Sunflower cake, husk"},
+    "Sesame": {"water": "300–500 mm", "soil": "Sandy loam", "climate": "25–35°C", "food": "Sesame cake, stalks (fuel)"},
+    "Soybean": {"water": "500–700 mm", "soil": "Loamy soil", "climate": "20–30°C", "food": "Soy cake, soy meal"},
+    "Castor": {"water": "400–600 mm", "soil": "Sandy loam", "climate": "20–35°C", "food": "Castor cake (manure), stems"},
+    "Linseed": {"water": "450–650 mm", "soil": "Loamy", "climate": "10–25°C", "food": "Linseed cake, fiber"},
+    "Safflower": {"water": "400–600 mm", "soil": "Loamy, well-drained", "climate": "15–30°C", "food": "Safflower cake, petals (dye)"},
+    "Niger": {"water": "500–800 mm", "soil": "Loamy", "climate": "20–30°C", "food": "Niger cake, bird feed"},
+    "Coconut": {"water": "1300–2300 mm", "soil": "Sandy loam", "climate": "20–35°C", "food": "Copra, coir, shell charcoal"}
+}
+
+# -------------------------------------------------
+# BEGINNER GUIDE
+# -------------------------------------------------
+GUIDE_STEPS = [
+    "🌱 Step 1: Understand soil & water",
+    "🌾 Step 2: Select suitable crops",
+    "💧 Step 3: Efficient irrigation",
+    "🌿 Step 4: Prefer organic methods",
+    "🧺 Step 5: Harvest & store properly",
+]
+GUIDE_DOS = ["Soil testing", "Crop rotation", "Use organic manure"]
+GUIDE_DONTS = ["Don't waste water", "Don't overuse chemicals", "Don't lose confidence"]
+
+# -------------------------------------------------
+# LANGUAGE PACKS
+# -------------------------------------------------
+# One JSON file per language in lang/. Packs are loaded, validated and
+# pre-rendered once per process; a key missing from a pack falls back to English.
+LANG_DIR = Path(__file__).with_name("lang")
+LANGUAGES = {"English": "en", "தமிழ்": "ta"}
+FALLBACK_LANGUAGE = "English"
+
+PACK_FIELDS = {"title": str, "subtitle": str, "problems": list, "solutions": list, "gov_schemes": dict}
+
+LanguagePack = namedtuple(
+    "LanguagePack", "language title subtitle problems solutions gov_schemes problems_md schemes_md"
+)
+
+
+def validate_pack(data, source):
+    for key, value in data.items():
+        expected = PACK_FIELDS.get(key)
+        if expected is None:
+            continue
+        if not isinstance(value, expected):
+            raise ValueError(f"{source}: {key!r} must be a {expected.__name__}")
+        if key in ("problems", "solutions") and not all(isinstance(v, str) for v in value):
+            raise ValueError(f"{source}: {key!r} must only contain strings")
+        if key == "gov_schemes":
+            for scheme, points in value.items():
+                if not isinstance(points, list) or not all(isinstance(p, str) for p in points):
+                    raise ValueError(f"{source}: scheme {scheme!r} must be a list of strings")
+
+
+def load_pack_file(language):
+    path = LANG_DIR / f"{LANGUAGES[language]}.json"
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    validate_pack(data, path)
+    return data
+
+
+@lru_cache(maxsize=None)
+def language_pack(language):
+    if language not in LANGUAGES:
+        language = FALLBACK_LANGUAGE
+    data = load_pack_file(language)
+    if language != FALLBACK_LANGUAGE:
+        fallback = load_pack_file(FALLBACK_LANGUAGE)
+        data = {key: data.get(key, fallback.get(key)) for key in PACK_FIELDS}
+    missing = [key for key in PACK_FIELDS if data.get(key) is None]
+    if missing:
+        raise ValueError(f"Language pack {language!r} is missing {', '.join(missing)}")
+
+    problems_md = "\n".join(f"- {p}" for p in data["problems"])
+    schemes_md = "\n\n".join(
+        f"### {scheme}\n" + "\n".join(f"- {p}" for p in points)
+        for scheme, points in data["gov_schemes"].items()
+    )
+    return LanguagePack(
+        language, data["title"], data["subtitle"], tuple(data["problems"]), tuple(data["solutions"]),
+        data["gov_schemes"], problems_md, schemes_md,
+    )
@@ -0,0 +1,135 @@
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from urllib.parse import quote
+
+from farmquest_certificate import render_certificate
+from farmquest_questions import level_count
+
+# -------------------------------------------------
+# ROSTERS
+# -------------------------------------------------
+def roster_from_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if "username" not in (reader.fieldnames or []):
+            raise ValueError(f"{path} needs a 'username' column")
+        for row in reader:
+            username = row["username"].strip()
+            if not username:
+                continue
+            completed = (row.get("completed_on") or "").strip()
+            yield username, date.fromisoformat(completed) if completed else date.today()
+
+
+def roster_from_store(path):
+    if not os.path.exists(path):
+        raise ValueError(f"No progress database at {path}")
+    # Read-only and without the store's pool, writer thread or schema setup,
+    # since this may well be the live app database
+    conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+    try:
+        players = conn.execute(
+            "SELECT username, completed_at FROM players WHERE completed_at IS NOT NULL ORDER BY completed_at"
+        ).fetchall()
+    except sqlite3.Error as e:
+        raise ValueError(f"Cannot read players from {path}: {e}") from e
+    finally:
+        conn.close()
+    for username, completed_at in players:
+        yield username, datetime.fromtimestamp(completed_at).date()
+
+
+# ZIP entry names are UTF-8, so only characters that are unsafe in a file
+# name go; Tamil vowel signs and other combining marks must stay
+UNSAFE_NAME_RE = re.compile(r'[/\\:*?"<>|\x00-\x1f\x7f]+')
+
+
+def archive_name(username, used):
+    base = UNSAFE_NAME_RE.sub("_", username).strip(" ._") or "player"
+    name, n = f"{base}_FarmQuest_Certificate.pdf", 1
+    while name in used:
+        n += 1
+        name = f"{base}_{n}_FarmQuest_Certificate.pdf"
+    used.add(name)
+    return name
+
+
+# -------------------------------------------------
+# EXPORT
+# -------------------------------------------------
+def render_job(job):
+    username, completed_on, levels = job
+    return username, render_certificate(username, completed_on, levels)
+
+
+def export_certificates(roster, output, workers=None, chunksize=8, levels=10, progress=None):
+    jobs = [(username, completed_on, levels) for username, completed_on in roster]
+    used = set()
+    start = time.perf_counter()
+
+    # Workers return PDF bytes and the parent streams them straight into the
+    # archive in roster order, so nothing touches disk except the ZIP itself
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, (username, pdf) in enumerate(pool.map(render_job, jobs, chunksize=chunksize), 1):
+            archive.writestr(archive_name(username, used), pdf)
+            if progress:
+                progress(done, len(jobs), time.perf_counter() - start)
+    return len(jobs), time.perf_counter() - start
+
+
+class ProgressPrinter:
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self._last = float("-inf")
+
+    def __call__(self, done, total, elapsed):
+        # Redraw a few times per second, and always for the final certificate
+        if done != total and elapsed - self._last < self.interval:
+            return
+        self._last = elapsed
+        rate = done / elapsed if elapsed else 0.0
+        print(f"\r{done}/{total} certificates  {rate:.1f} PDFs/s", end="", file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render FarmQuest certificates for a whole cohort into one ZIP")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--roster", help="CSV with a username column and optional completed_on (YYYY-MM-DD)")
+    source.add_argument("--db", help="progress database; exports every player who finished all levels")
+    parser.add_argument("-o", "--output", required=True, help="ZIP file to write, or - for stdout")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=8)
+    parser.add_argument("--levels", type=int, default=None, help="level count printed on the certificate")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        roster = list(roster_from_csv(args.roster) if args.roster else roster_from_store(args.db))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not roster:
+        print("Roster is empty; nothing to export", file=sys.stderr)
+        return 1
+
+    output = sys.stdout.buffer if args.output == "-" else args.output
+    count, elapsed = export_certificates(
+        roster, output, workers=args.workers, chunksize=args.chunksize,
+        levels=args.levels or level_count(), progress=None if args.quiet else ProgressPrinter(),
+    )
+    print(f"Exported {count} certificates in {elapsed:.1f}s ({count / elapsed:.1f} PDFs/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
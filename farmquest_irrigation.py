@@ -0,0 +1,173 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from farmquest_recommender import crop_table
+
+EFFICIENCY = {"drip": 0.9, "flood": 0.6}
+# Share of a day's rain the crop can actually use; the rest runs off or drains
+EFFECTIVE_RAIN = 0.8
+DEFAULT_SEASON_DAYS = 120
+CHUNK_ROWS = 20_000
+
+# Crop coefficient over the season (FAO-56 style): low while establishing,
+# peak through flowering, tapering as the crop matures
+KC_PROGRESS = np.array([0.0, 0.2, 0.45, 0.8, 1.0])
+KC_VALUES = np.array([0.4, 0.4, 1.15, 1.15, 0.7])
+KC_MEAN = float(np.sum(np.diff(KC_PROGRESS) * (KC_VALUES[1:] + KC_VALUES[:-1]) / 2))
+
+
+# -------------------------------------------------
+# INPUTS
+# -------------------------------------------------
+def load_rainfall(source):
+    rain = pd.read_csv(source)
+    missing = {"date", "rainfall"} - set(rain.columns)
+    if missing:
+        raise ValueError(f"Rainfall CSV is missing column(s): {', '.join(sorted(missing))}")
+    if rain.empty:
+        raise ValueError("Rainfall CSV has no rows")
+    rain["date"] = pd.to_datetime(rain["date"])
+    # One value per calendar day; days without a reading count as dry
+    return rain.set_index("date")["rainfall"].astype(float).resample("D").sum()
+
+
+def seasonal_need(crops):
+    table = crop_table()
+    names = pd.Series(crops, dtype="string").str.strip()
+    lookup = {c.lower(): c for c in table.index}
+    matched = names.str.lower().map(lookup)
+    if matched.isna().any():
+        bad = sorted(set(names[matched.isna()].astype(str)))
+        raise ValueError(f"Unknown crop(s) {bad}; expected one of {list(table.index)}")
+    # Midpoint of the crop's "600–800 mm" style seasonal water range
+    need = (table["rain_min"] + table["rain_max"]) / 2
+    return need.loc[matched].to_numpy()
+
+
+# -------------------------------------------------
+# SIMULATION
+# -------------------------------------------------
+def demand_matrix(need_mm, sow_day, season_days, days):
+    # plots × days crop water demand in mm; zero outside each plot's season
+    progress = (np.arange(days)[None, :] - sow_day[:, None]) / season_days[:, None]
+    in_season = (progress >= 0) & (progress < 1)
+    kc = np.interp(progress, KC_PROGRESS, KC_VALUES)
+    return np.where(in_season, kc * (need_mm / (KC_MEAN * season_days))[:, None], 0.0)
+
+
+def simulate(need_mm, sow_day, season_days, rainfall_mm):
+    demand = demand_matrix(need_mm, sow_day, season_days, len(rainfall_mm))
+    rain = EFFECTIVE_RAIN * np.asarray(rainfall_mm, dtype=float)[None, :]
+    deficit = np.maximum(demand - rain, 0.0)
+    return demand, np.minimum(rain, demand), deficit
+
+
+def plot_inputs(plots, rainfall):
+    need = seasonal_need(plots["crop"].to_numpy())
+    if "sown_on" in plots:
+        # A blank sowing date means the plot is sown when the rainfall series starts
+        sow_day = (pd.to_datetime(plots["sown_on"]) - rainfall.index[0]).dt.days.fillna(0).to_numpy()
+    else:
+        sow_day = np.zeros(len(plots), dtype=int)
+    if "season_days" in plots:
+        season_days = plots["season_days"].to_numpy(dtype=float)
+    else:
+        season_days = np.full(len(plots), float(DEFAULT_SEASON_DAYS))
+    return need, sow_day, season_days
+
+
+def season_coverage(sow_day, season_days, days):
+    # Share of each plot's season that falls inside the rainfall series
+    covered = np.minimum(sow_day + season_days, days) - np.maximum(sow_day, 0)
+    return np.clip(covered, 0, None) / season_days
+
+
+def plan_irrigation(plots, rainfall):
+    week_starts = np.arange(0, len(rainfall), 7)
+    weeks = rainfall.index[week_starts]
+    ids = plots["plot"].to_numpy() if "plot" in plots else plots.index.to_numpy()
+
+    totals, weekly = [], []
+    for start in range(0, len(plots), CHUNK_ROWS):
+        part = plots.iloc[start:start + CHUNK_ROWS]
+        need, sow_day, season_days = plot_inputs(part, rainfall)
+        demand, rain_used, deficit = simulate(need, sow_day, season_days, rainfall.to_numpy())
+        # 1 mm over 1 ha is 10 m³
+        area_m3 = part["area"].to_numpy(dtype=float)[:, None] * 10
+        net_week = np.add.reduceat(deficit, week_starts, axis=1)
+        dry_days = np.add.reduceat(deficit > 0, week_starts, axis=1)
+
+        net = deficit.sum(axis=1)
+        peak = np.where(net_week.max(axis=1) > 0, net_week.argmax(axis=1), -1)
+        totals.append(pd.DataFrame({
+            "plot": ids[start:start + CHUNK_ROWS],
+            "crop": part["crop"].to_numpy(),
+            "area": part["area"].to_numpy(),
+            "demand_mm": demand.sum(axis=1).round(1),
+            "rain_used_mm": rain_used.sum(axis=1).round(1),
+            "net_mm": net.round(1),
+            "drip_m3": (net * area_m3[:, 0] / EFFICIENCY["drip"]).round(1),
+            "flood_m3": (net * area_m3[:, 0] / EFFICIENCY["flood"]).round(1),
+            "peak_week": pd.DatetimeIndex(np.where(peak >= 0, weeks[np.maximum(peak, 0)], pd.NaT)),
+            # Totals only cover this share of the season; below 1 they understate the need
+            "coverage": season_coverage(sow_day, season_days, len(rainfall)).round(3),
+        }))
+        # Drip runs on every day with a deficit; flood tops up once a week
+        weekly.append(pd.DataFrame({
+            "plot": np.repeat(ids[start:start + CHUNK_ROWS], len(weeks)),
+            "week": np.tile(weeks, len(part)),
+            "net_mm": net_week.ravel().round(1),
+            "drip_m3": (net_week * area_m3 / EFFICIENCY["drip"]).ravel().round(2),
+            "drip_days": dry_days.ravel(),
+            "flood_m3": (net_week * area_m3 / EFFICIENCY["flood"]).ravel().round(2),
+            "flood_events": (net_week > 0).ravel().astype(int),
+        }))
+
+    if not totals:
+        return pd.DataFrame(), pd.DataFrame()
+    totals = pd.concat(totals, ignore_index=True)
+    totals["saved_m3"] = (totals["flood_m3"] - totals["drip_m3"]).round(1)
+    return totals, pd.concat(weekly, ignore_index=True)
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simulate a season's irrigation need per plot and compare drip with flood"
+    )
+    parser.add_argument("plots", help="CSV with crop and area (ha); optional plot, sown_on and season_days")
+    parser.add_argument("rainfall", help="CSV with date and rainfall (mm) per day")
+    parser.add_argument("-o", "--output", help="write per-plot totals here instead of stdout")
+    parser.add_argument("--weekly", help="also write the per-plot weekly schedule to this CSV")
+    args = parser.parse_args(argv)
+
+    plots = pd.read_csv(args.plots)
+    missing = {"crop", "area"} - set(plots.columns)
+    if missing:
+        parser.error(f"missing column(s): {', '.join(sorted(missing))}")
+
+    start = time.perf_counter()
+    try:
+        totals, weekly = plan_irrigation(plots, load_rainfall(args.rainfall))
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    partial = int((totals["coverage"] < 1).sum()) if len(totals) else 0
+    if partial:
+        print(f"Warning: rainfall series covers only part of the season for {partial} plot(s); "
+              "see the coverage column", file=sys.stderr)
+    totals.to_csv(args.output or sys.stdout, index=False)
+    if args.weekly:
+        weekly.to_csv(args.weekly, index=False)
+    print(f"Planned {len(plots)} plots over {len(weekly) // max(len(plots), 1)} weeks in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+# Rows flushed late by another process can carry an updated_at slightly older
+# than what we already synced, so every sync looks back this many seconds
+SYNC_OVERLAP = 10.0
+
+
+# -------------------------------------------------
+# RANKED SET
+# -------------------------------------------------
+class RankedSet:
+    def __init__(self):
+        self._keys = []
+        self._by_name = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def upsert(self, username, key):
+        key = key + (username,)
+        old = self._by_name.get(username)
+        if old == key:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, old)]
+        insort(self._keys, key)
+        self._by_name[username] = key
+
+    def remove(self, username):
+        old = self._by_name.pop(username, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, old)]
+
+    def top(self, n):
+        return self._keys[:n]
+
+    def rank(self, username):
+        key = self._by_name.get(username)
+        return None if key is None else bisect_left(self._keys, key) + 1
+
+
+# -------------------------------------------------
+# LEADERBOARD
+# -------------------------------------------------
+class Leaderboard:
+    def __init__(self, store=None, refresh_interval=5.0):
+        self.store = store
+        self.refresh_interval = refresh_interval
+        self._players = {}
+        self._by_xp = RankedSet()
+        self._by_time = RankedSet()
+        self._lock = threading.Lock()
+        self._synced_to = 0.0
+        self._snapshot = None
+        self._snapshot_at = float("-inf")
+
+    def record(self, progress):
+        with self._lock:
+            self._record(progress)
+
+    def _record(self, progress):
+        # Merge like the store's upsert: keep the earliest start and first completion
+        old = self._players.get(progress.username)
+        if old is not None:
+            if old.updated_at > progress.updated_at:
+                return
+            progress = progress._replace(
+                started_at=min(old.started_at, progress.started_at),
+                completed_at=old.completed_at or progress.completed_at,
+            )
+        self._players[progress.username] = progress
+
+        # Ties on XP go to whoever reached it first
+        self._by_xp.upsert(progress.username, (-progress.xp, progress.updated_at))
+        if progress.completed_at:
+            self._by_time.upsert(progress.username, (progress.completed_at - progress.started_at,))
+        self._synced_to = max(self._synced_to, progress.updated_at)
+
+    def sync(self):
+        if self.store is None:
+            return
+        rows = self.store.changed_since(self._synced_to - SYNC_OVERLAP)
+        with self._lock:
+            for row in rows:
+                self._record(row)
+
+    def top_xp(self, n=10):
+        with self._lock:
+            return [(username, -neg_xp) for neg_xp, _, username in self._by_xp.top(n)]
+
+    def top_time(self, n=10):
+        with self._lock:
+            return [(username, seconds) for seconds, username in self._by_time.top(n)]
+
+    def rank_xp(self, username):
+        with self._lock:
+            return self._by_xp.rank(username)
+
+    def rank_time(self, username):
+        with self._lock:
+            return self._by_time.rank(username)
+
+    def snapshot(self, n=10):
+        now = time.monotonic()
+        if now - self._snapshot_at >= self.refresh_interval:
+            self.sync()
+            with self._lock:
+                players = len(self._by_xp)
+            self._snapshot = {"players": players, "xp": self.top_xp(n), "time": self.top_time(n)}
+            self._snapshot_at = now
+        return self._snapshot
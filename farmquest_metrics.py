@@ -0,0 +1,192 @@
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, Prometheus-style; the last bucket is +Inf
+TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+ALLOC_BUCKETS = (0, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+# -------------------------------------------------
+# HISTOGRAMS
+# -------------------------------------------------
+class Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def observe(self, section, seconds, allocated_blocks=None):
+        with self._lock:
+            hists = self._sections.get(section)
+            if hists is None:
+                hists = self._sections[section] = (Histogram(TIME_BUCKETS), Histogram(ALLOC_BUCKETS))
+            hists[0].observe(seconds)
+            if allocated_blocks is not None:
+                # Net new blocks can be negative when a section frees more than it allocates
+                hists[1].observe(max(allocated_blocks, 0))
+
+    def summary(self):
+        with self._lock:
+            return [
+                {
+                    "section": section,
+                    "calls": wall.count,
+                    "mean_ms": round(wall.total / wall.count * 1000, 3),
+                    "p50_ms": wall.quantile(0.5) * 1000,
+                    "p95_ms": wall.quantile(0.95) * 1000,
+                    "total_s": round(wall.total, 3),
+                    "mean_blocks": round(allocs.total / allocs.count, 1) if allocs.count else None,
+                }
+                for section, (wall, allocs) in sorted(self._sections.items())
+            ]
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            sections = sorted(self._sections.items())
+            for metric, index, help_text in (
+                ("farmquest_section_seconds", 0, "Wall time per instrumented section"),
+                ("farmquest_section_allocated_blocks", 1, "Net new Python memory blocks per section call"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for section, hists in sections:
+                    hist = hists[index]
+                    if not hist.count:
+                        continue
+                    label = section.replace("\\", "\\\\").replace('"', '\\"')
+                    cumulative = 0
+                    for bound, n in zip(hist.bounds + ("+Inf",), hist.counts):
+                        cumulative += n
+                        lines.append(f'{metric}_bucket{{section="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{section="{label}"}} {hist.total}')
+                    lines.append(f'{metric}_count{{section="{label}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+
+
+registry = Registry()
+
+
+# -------------------------------------------------
+# INSTRUMENTATION
+# -------------------------------------------------
+# Allocation tracking is off unless FARMQUEST_TRACK_ALLOCS=1. sys.getallocatedblocks()
+# walks the allocator's arenas, so it costs tens of microseconds per call and far
+# more on a large heap. It counts net surviving blocks across the whole process,
+# so other threads and nested sections leak into the figure; treat it as a rough
+# signal for profiling sessions only.
+track_allocations = os.environ.get("FARMQUEST_TRACK_ALLOCS") == "1"
+
+
+@contextmanager
+def timed(section):
+    blocks = sys.getallocatedblocks() if track_allocations else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if blocks is not None:
+            blocks = sys.getallocatedblocks() - blocks
+        registry.observe(section, elapsed, blocks)
+
+
+def timed_function(section):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(section):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -------------------------------------------------
+# EXPORTERS
+# -------------------------------------------------
+def write_metrics_file(path):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render_prometheus())
+    os.replace(tmp, path)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Streamlit's "Clear caches" drops cache_resource entries, so the app can call
+# this again in the same process; each exporter starts at most once
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def start_exporters(metrics_file=None, port=None, interval=15.0):
+    started = []
+    with _exporters_lock:
+        if metrics_file:
+            if ("file", metrics_file) not in _exporters:
+                def write_loop():
+                    while True:
+                        time.sleep(interval)
+                        write_metrics_file(metrics_file)
+
+                threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+                _exporters[("file", metrics_file)] = f"file:{metrics_file}"
+            started.append(_exporters[("file", metrics_file)])
+        if port:
+            if ("http", int(port)) not in _exporters:
+                # Bound to localhost only; put a scraper or reverse proxy in front if needed
+                server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+                threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+                _exporters[("http", int(port))] = f"http://127.0.0.1:{server.server_port}/metrics"
+            started.append(_exporters[("http", int(port))])
+    return started
@@ -0,0 +1,245 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+
+Progress = namedtuple("Progress", "username xp level started_at updated_at completed_at")
+
+# -------------------------------------------------
+# STORE INTERFACE
+# -------------------------------------------------
+class ProgressStore(ABC):
+    @abstractmethod
+    def load(self, username):
+        ...
+
+    @abstractmethod
+    def save(self, username, xp, level, completed=False):
+        ...
+
+    @abstractmethod
+    def changed_since(self, since):
+        ...
+
+    @abstractmethod
+    def completed(self):
+        ...
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class MemoryProgressStore(ProgressStore):
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def load(self, username):
+        with self._lock:
+            return self._rows.get(username)
+
+    def save(self, username, xp, level, completed=False):
+        with self._lock:
+            row = _next_row(self._rows.get(username), username, xp, level, completed)
+            self._rows[username] = row
+        return row
+
+    def changed_since(self, since):
+        with self._lock:
+            return [row for row in self._rows.values() if row.updated_at > since]
+
+    def completed(self):
+        with self._lock:
+            return sorted((r for r in self._rows.values() if r.completed_at), key=lambda r: r.completed_at)
+
+
+def _next_row(old, username, xp, level, completed):
+    now = time.time()
+    started_at = old.started_at if old else now
+    completed_at = old.completed_at if old and old.completed_at else (now if completed else None)
+    return Progress(username, xp, level, started_at, now, completed_at)
+
+
+# -------------------------------------------------
+# SQLITE BACKEND
+# -------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    username TEXT PRIMARY KEY,
+    xp INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS players_updated_at ON players (updated_at);
+"""
+
+# Only newer writes win, so two app processes flushing the same player cannot
+# roll each other back
+UPSERT = """
+INSERT INTO players (username, xp, level, started_at, updated_at, completed_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(username) DO UPDATE SET
+    xp = excluded.xp,
+    level = excluded.level,
+    updated_at = excluded.updated_at,
+    completed_at = COALESCE(players.completed_at, excluded.completed_at)
+WHERE excluded.updated_at >= players.updated_at
+"""
+
+
+COLUMNS = ", ".join(Progress._fields)
+
+
+class SQLiteProgressStore(ProgressStore):
+    def __init__(self, path, pool_size=4, flush_interval=0.5, batch_size=500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(players)")]
+            if columns and "completed_at" not in columns:
+                conn.execute("ALTER TABLE players ADD COLUMN completed_at REAL")
+            conn.executescript(SCHEMA)
+
+        # Writes from the script thread land here and are coalesced per player.
+        # A batch being flushed moves to _inflight and stays readable until it
+        # commits, so a load during the flush never sees the older stored row.
+        self._pending = {}
+        self._inflight = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run_writer, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _unflushed(self, username):
+        with self._pending_lock:
+            return self._pending.get(username) or self._inflight.get(username)
+
+    def load(self, username):
+        row = self._unflushed(username)
+        if row is not None:
+            return row
+        return self._load_stored(username)
+
+    def _load_stored(self, username):
+        with self._connection() as conn:
+            row = conn.execute(
+                f"SELECT {COLUMNS} FROM players WHERE username = ?", (username,)
+            ).fetchone()
+        return Progress(*row) if row else None
+
+    def save(self, username, xp, level, completed=False):
+        old = self._unflushed(username)
+        if old is None:
+            # Already flushed: carry the stored started_at/completed_at forward
+            # so the returned row and load() do not report fresh timestamps
+            old = self._load_stored(username)
+        with self._pending_lock:
+            old = self._pending.get(username) or self._inflight.get(username) or old
+            row = _next_row(old, username, xp, level, completed)
+            self._pending[username] = row
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+        return row
+
+    def changed_since(self, since):
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM players WHERE updated_at > ?", (since,)
+            ).fetchall()
+        with self._pending_lock:
+            unflushed = {**self._inflight, **self._pending}
+            pending = [row for row in unflushed.values() if row.updated_at > since]
+        return [Progress(*row) for row in rows] + pending
+
+    def completed(self):
+        self.flush()
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM players WHERE completed_at IS NOT NULL ORDER BY completed_at"
+            ).fetchall()
+        return [Progress(*row) for row in rows]
+
+    def flush(self):
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return
+            with self._connection() as conn:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        conn.executemany(UPSERT, batch.values())
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                except Exception:
+                    # Put the batch back unless newer saves already replaced it
+                    with self._pending_lock:
+                        for username, row in batch.items():
+                            self._pending.setdefault(username, row)
+                        self._inflight = {}
+                    raise
+            with self._pending_lock:
+                self._inflight = {}
+
+    def _run_writer(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Keep the writer alive; the batch is retried on the next tick
+                time.sleep(self.flush_interval)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        while not self._pool.empty():
+            self._pool.get().close()
+
+
+def open_progress_store(path):
+    if path == ":memory:":
+        return MemoryProgressStore()
+    store = SQLiteProgressStore(path)
+    atexit.register(store.close)
+    return store
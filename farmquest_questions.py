@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from farmquest_content import LANGUAGES
+
+QUESTIONS_DIR = Path(__file__).with_name("questions")
+DEFAULT_LEVEL_COUNT = 10
+
+Question = namedtuple("Question", "id topic question options answer")
+
+# -------------------------------------------------
+# PACKED FORMAT
+# -------------------------------------------------
+# header | offsets uint64[count + 1] | topic ids uint16[count] | topic names JSON | records
+# Each record is a compact JSON array [id, question, options, answer index],
+# so a lookup decodes only the one question it needs.
+MAGIC = b"FQB1"
+HEADER = struct.Struct("<4sII")
+
+
+def compile_bank(source, target):
+    ids, topics, records = set(), {}, []
+    topic_ids = []
+    with open(source, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item["id"] in ids:
+                raise ValueError(f"{source}:{line_no}: duplicate question id {item['id']!r}")
+            if item["answer"] not in item["options"]:
+                raise ValueError(f"{source}:{line_no}: answer is not one of the options")
+            ids.add(item["id"])
+            topic_ids.append(topics.setdefault(item["topic"], len(topics)))
+            records.append(json.dumps(
+                [item["id"], item["question"], item["options"], item["options"].index(item["answer"])],
+                ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8"))
+
+    topic_blob = json.dumps(list(topics), ensure_ascii=False).encode("utf-8")
+    offsets = np.zeros(len(records) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum([len(r) for r in records])
+
+    tmp = Path(f"{target}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), len(topic_blob)))
+        f.write(offsets.tobytes())
+        f.write(np.asarray(topic_ids, dtype="<u2").tobytes())
+        f.write(topic_blob)
+        for record in records:
+            f.write(record)
+    os.replace(tmp, target)
+    return len(records)
+
+
+# -------------------------------------------------
+# MEMORY-MAPPED BANK
+# -------------------------------------------------
+class QuestionBank:
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, topic_len = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a FarmQuest question bank")
+        pos = HEADER.size
+        # Zero-copy views over the mapping; pages load only when touched
+        self._offsets = np.frombuffer(self._map, dtype="<u8", count=count + 1, offset=pos)
+        pos += self._offsets.nbytes
+        self._topic_ids = np.frombuffer(self._map, dtype="<u2", count=count, offset=pos)
+        pos += self._topic_ids.nbytes
+        self.topics = json.loads(self._map[pos:pos + topic_len].decode("utf-8"))
+        self._data_start = pos + topic_len
+
+        self._topic_index = {}
+        self._id_index = None
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._topic_ids)
+
+    def get(self, index):
+        start = self._data_start + int(self._offsets[index])
+        end = self._data_start + int(self._offsets[index + 1])
+        qid, question, options, answer = json.loads(self._map[start:end].decode("utf-8"))
+        return Question(qid, self.topics[self._topic_ids[index]], question, options, options[answer])
+
+    def find(self, qid):
+        # Decodes every record once, then lookups are a dict hit
+        if self._id_index is None:
+            with self._lock:
+                if self._id_index is None:
+                    self._id_index = {question.id: i for i, question in enumerate(self)}
+        index = self._id_index.get(qid)
+        return None if index is None else self.get(index)
+
+    def topic_indices(self, topic):
+        indices = self._topic_index.get(topic)
+        if indices is None:
+            indices = np.flatnonzero(self._topic_ids == self.topics.index(topic))
+            self._topic_index[topic] = indices
+        return indices
+
+    def by_topic(self, topic, position):
+        return self.get(int(self.topic_indices(topic)[position]))
+
+    def player_plan(self, username, level_count, topic=None):
+        key = (username, level_count, topic)
+        with self._lock:
+            plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        pool = self.topic_indices(topic) if topic else np.arange(len(self))
+        # Seeded by the player so every process and rerun draws the same questions
+        seed = int.from_bytes(hashlib.sha256(username.encode("utf-8")).digest()[:8], "little")
+        picked = np.random.default_rng(seed).choice(pool, size=min(level_count, len(pool)), replace=False)
+        # Keep the bank's own order so early levels stay the easier questions
+        plan = np.sort(picked)
+        with self._lock:
+            if len(self._plans) > 10_000:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
+
+    def level(self, username, level, level_count):
+        plan = self.player_plan(username, level_count)
+        # A smaller bank than the configured level count repeats its questions
+        return self.get(int(plan[(level - 1) % len(plan)]))
+
+    def __iter__(self):
+        return (self.get(i) for i in range(len(self)))
+
+
+def bank_path(code):
+    return QUESTIONS_DIR / f"{code}.fqb", QUESTIONS_DIR / f"{code}.jsonl"
+
+
+@lru_cache(maxsize=None)
+def question_bank(language="English"):
+    code = LANGUAGES.get(language, "en")
+    packed, source = bank_path(code)
+    if not source.exists() and not packed.exists():
+        # No bank for this language yet; fall back to English
+        packed, source = bank_path("en")
+    if source.exists() and (not packed.exists() or packed.stat().st_mtime < source.stat().st_mtime):
+        try:
+            compile_bank(source, packed)
+        except OSError:
+            # Read-only install: pack into the temp directory instead
+            packed = Path(tempfile.gettempdir()) / f"farmquest-{code}-{int(source.stat().st_mtime)}.fqb"
+            if not packed.exists():
+                compile_bank(source, packed)
+    return QuestionBank(packed)
+
+
+def level_count():
+    # Completion must not depend on the language picked, so the English bank sets the cap
+    configured = int(os.environ.get("FARMQUEST_LEVELS", DEFAULT_LEVEL_COUNT))
+    if configured < 1:
+        # Zero levels would unlock the certificate before a single answer
+        raise ValueError(f"FARMQUEST_LEVELS must be at least 1, got {configured}")
+    return min(configured, len(question_bank("English")))
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect packed FarmQuest question banks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="pack a JSONL question file")
+    build.add_argument("source")
+    build.add_argument("target", nargs="?", help="defaults to the source path with .fqb")
+    info = sub.add_parser("info", help="summarize a packed bank")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        target = args.target or str(Path(args.source).with_suffix(".fqb"))
+        count = compile_bank(args.source, target)
+        print(f"Packed {count} questions into {target}")
+    else:
+        bank = QuestionBank(args.path)
+        print(f"{len(bank)} questions, {os.path.getsize(args.path)} bytes")
+        for topic in bank.topics:
+            print(f"  {topic}: {len(bank.topic_indices(topic))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
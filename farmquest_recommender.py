@@ -0,0 +1,163 @@
+import argparse
+import re
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from farmquest_content import crop_data
+
+SOILS = ["Loamy", "Sandy loam", "Sandy", "Clay"]
+
+# How well a plot's soil (row) suits a crop that wants the column soil
+SOIL_COMPAT = np.array([
+    [1.0, 0.6, 0.2, 0.3],
+    [0.6, 1.0, 0.6, 0.1],
+    [0.2, 0.6, 1.0, 0.0],
+    [0.3, 0.1, 0.0, 1.0],
+])
+WEIGHTS = {"rainfall": 0.4, "temperature": 0.4, "soil": 0.2}
+
+RANGE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*[–-]\s*(\d+(?:\.\d+)?)")
+CHUNK_ROWS = 100_000
+
+
+# -------------------------------------------------
+# PARSED CROP TABLE
+# -------------------------------------------------
+def parse_range(text):
+    match = RANGE_RE.search(text)
+    if not match:
+        raise ValueError(f"No numeric range in {text!r}")
+    return float(match.group(1)), float(match.group(2))
+
+
+def parse_soil(text):
+    text = text.lower()
+    soils = set()
+    if "sandy loam" in text:
+        soils.add("Sandy loam")
+        text = text.replace("sandy loam", "")
+    if "sandy" in text:
+        soils.add("Sandy")
+    if "loam" in text:
+        soils.add("Loamy")
+    if "clay" in text:
+        soils.add("Clay")
+    return soils
+
+
+@lru_cache(maxsize=1)
+def crop_table():
+    rows = []
+    for name, info in crop_data.items():
+        rain_min, rain_max = parse_range(info["water"])
+        temp_min, temp_max = parse_range(info["climate"])
+        soils = parse_soil(info["soil"])
+        row = {
+            "crop": name,
+            "rain_min": rain_min, "rain_max": rain_max,
+            "temp_min": temp_min, "temp_max": temp_max,
+        }
+        row.update({f"soil_{s}": s in soils for s in SOILS})
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("crop")
+
+
+# -------------------------------------------------
+# SCORING
+# -------------------------------------------------
+def range_fit(values, lo, hi):
+    # 1 inside the range, falling linearly to 0 one range-width outside it
+    width = np.maximum(hi - lo, 1.0)
+    distance = np.maximum(lo - values, 0) + np.maximum(values - hi, 0)
+    return np.clip(1 - distance / width, 0, 1)
+
+
+def soil_index(soils):
+    lookup = {s.lower(): i for i, s in enumerate(SOILS)}
+    codes = pd.Series(soils, dtype="string").str.strip().str.lower().map(lookup)
+    if codes.isna().any():
+        bad = sorted(set(pd.Series(soils)[codes.isna().to_numpy()].astype(str)))
+        raise ValueError(f"Unknown soil type(s) {bad}; expected one of {SOILS}")
+    return codes.to_numpy(dtype=np.intp)
+
+
+def score_matrix(rainfall, temperature, soils):
+    table = crop_table()
+    rain = np.asarray(rainfall, dtype=float)[:, None]
+    temp = np.asarray(temperature, dtype=float)[:, None]
+
+    soil_ok = table[[f"soil_{s}" for s in SOILS]].to_numpy()
+    # Best match between the plot's soil and any soil the crop accepts
+    soil = (SOIL_COMPAT[soil_index(soils)][:, None, :] * soil_ok[None, :, :]).max(axis=2)
+
+    return (
+        WEIGHTS["rainfall"] * range_fit(rain, table["rain_min"].to_numpy(), table["rain_max"].to_numpy())
+        + WEIGHTS["temperature"] * range_fit(temp, table["temp_min"].to_numpy(), table["temp_max"].to_numpy())
+        + WEIGHTS["soil"] * soil
+    )
+
+
+def recommend(rainfall, temperature, soil, top_n=None):
+    table = crop_table()
+    scores = score_matrix([rainfall], [temperature], [soil])[0]
+    ranked = pd.DataFrame({
+        "crop": table.index,
+        "score": scores.round(3),
+        "water": [crop_data[c]["water"] for c in table.index],
+        "climate": [crop_data[c]["climate"] for c in table.index],
+        "soil": [crop_data[c]["soil"] for c in table.index],
+    }).sort_values("score", ascending=False, kind="stable").reset_index(drop=True)
+    return ranked if top_n is None else ranked.head(top_n)
+
+
+def recommend_plots(plots, top_n=3):
+    crops = crop_table().index.to_numpy()
+    chunks = []
+    for start in range(0, len(plots), CHUNK_ROWS):
+        part = plots.iloc[start:start + CHUNK_ROWS]
+        scores = score_matrix(part["rainfall"].to_numpy(), part["temperature"].to_numpy(), part["soil"].to_numpy())
+        best = np.argsort(-scores, axis=1, kind="stable")[:, :top_n]
+        out = pd.DataFrame(index=part.index)
+        for k in range(best.shape[1]):
+            out[f"crop_{k + 1}"] = crops[best[:, k]]
+            out[f"score_{k + 1}"] = np.take_along_axis(scores, best[:, k:k + 1], axis=1)[:, 0].round(3)
+        chunks.append(out)
+    if not chunks:
+        return plots.copy()
+    return plots.join(pd.concat(chunks))
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank crops for every plot in a CSV with rainfall, temperature and soil columns"
+    )
+    parser.add_argument("plots", help="CSV with rainfall (mm), temperature (°C) and soil columns")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    plots = pd.read_csv(args.plots)
+    missing = {"rainfall", "temperature", "soil"} - set(plots.columns)
+    if missing:
+        parser.error(f"missing column(s): {', '.join(sorted(missing))}")
+
+    start = time.perf_counter()
+    try:
+        result = recommend_plots(plots, args.top)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    result.to_csv(args.output or sys.stdout, index=False)
+    print(f"Scored {len(plots)} plots in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
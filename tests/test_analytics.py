@@ -0,0 +1,15 @@
+from farmquest_analytics import EventLog, load_events, summarize
+
+
+def test_numeric_looking_fields_stay_strings(tmp_path):
+    log = EventLog(tmp_path)
+    log.emit("assistant_query", username="1", query="2024", source=None, score=0.0)
+    log.emit("quiz_submit", username="1", level=1, question_id="en-0001", correct=False)
+    log.close()
+
+    events = load_events(tmp_path)
+    assert events["username"].tolist() == ["1", "1"]
+
+    tables = summarize(events)
+    assert tables["unanswered_terms"]["term"].tolist() == ["2024"]
+    assert tables["wrong_answers"]["wrong_rate"].tolist() == [1.0]
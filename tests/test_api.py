@@ -0,0 +1,59 @@
+import socket
+
+import pytest
+
+from farmquest_api import READ_TIMEOUT, LocalClient
+from farmquest_progress import MemoryProgressStore
+
+
+@pytest.fixture(scope="module")
+def client():
+    store = MemoryProgressStore()
+    store.save("Asha", 200, 11, completed=True)
+    store.save("Ravi", 40, 3)
+    with LocalClient(progress_store=store) as client:
+        yield client
+
+
+def test_crops(client):
+    status, body = client.get("/crops/tomato")
+    assert status == 200
+    assert body["crop"] == "Tomato"
+    assert client.get("/crops/nope")[0] == 404
+
+
+def test_grade_does_not_reveal_answer(client):
+    status, body = client.post("/grade", {"question_id": "en-0001", "answer": "Mining"})
+    assert status == 200
+    assert body == {"question_id": "en-0001", "correct": False}
+
+    status, body = client.post("/grade", [
+        {"question_id": "en-0001", "answer": "Growing crops"},
+        {"question_id": "missing", "answer": "x"},
+    ])
+    assert body[0] == {"question_id": "en-0001", "correct": True}
+    assert "error" in body[1]
+
+
+def test_assistant_single_and_batch(client):
+    status, body = client.post("/assistant", {"question": "pests on my crop"})
+    assert status == 200
+    assert body["answer"] == "🐛 Neem oil is natural & safe."
+
+    status, body = client.post("/assistant", {"questions": ["wheat", "quantum spaceship"]})
+    assert [a["source"] for a in body["answers"]] == ["tip", None]
+
+
+def test_certificate_requires_completion(client):
+    status, pdf = client.post("/certificate", {"username": "Asha"})
+    assert status == 200
+    assert pdf.startswith(b"%PDF-")
+
+    assert client.post("/certificate", {"username": "Ravi"})[0] == 403
+    assert client.post("/certificate", {"username": "Nobody"})[0] == 404
+
+
+def test_negative_content_length_gets_a_response(client):
+    with socket.create_connection(("127.0.0.1", client.port), timeout=READ_TIMEOUT) as sock:
+        sock.sendall(b"POST /grade HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        assert sock.recv(4096).startswith(b"HTTP/1.1 400")
@@ -0,0 +1,74 @@
+import pytest
+
+from farmquest_assistant import ask_assistant, farming_ai
+from farmquest_questions import question_bank
+
+RICE = "🌾 Rice needs clay soil, high water, warm climate."
+WHEAT = "🌾 Wheat grows well in loamy soil, moderate water, cool climate."
+MILLET = "🌾 Millets require low water, dry regions."
+SOIL = "🌍 Healthy soil contains nutrients, organic matter, and good drainage."
+WATER = "💧 Drip irrigation saves water and improves yield."
+FERTILIZER = "🌱 Organic fertilizers improve soil health."
+PEST = "🐛 Neem oil is natural & safe."
+DISEASE = "🦠 Crop rotation & healthy soil prevent diseases."
+
+
+# Replies the original keyword assistant gave
+@pytest.mark.parametrize("question, reply", [
+    ("rice", RICE),
+    ("how much water does rice need?", RICE),
+    ("wheat", WHEAT),
+    ("millet", MILLET),
+    ("soil", SOIL),
+    ("water", WATER),
+    ("irrigation", WATER),
+    ("Which saves water?", WATER),
+    ("fertilizer", FERTILIZER),
+    ("pest", PEST),
+    ("insects on my plants", PEST),
+    ("disease", DISEASE),
+])
+def test_keyword_replies(question, reply):
+    assert farming_ai(question) == reply
+
+
+@pytest.mark.parametrize("question", ["scheme", "government help"])
+def test_scheme_overview(question):
+    answer = ask_assistant(question)
+    assert answer.source == "schemes"
+    assert answer.text.startswith("🌾 **Government Schemes:**")
+
+
+@pytest.mark.parametrize("question, source", [
+    ("PM-KISAN", "scheme:PM-KISAN"),
+    ("what does PMFBY cover?", "scheme:PMFBY – Crop Insurance"),
+    ("PMKSY micro irrigation", "scheme:PMKSY – Micro Irrigation"),
+    ("organic farming support", "scheme:Organic Farming Support"),
+])
+def test_scheme_name_or_acronym_routes(question, source):
+    assert ask_assistant(question).source == source
+
+
+# Words from a scheme's name are too generic to route on by themselves
+@pytest.mark.parametrize("question, source", [
+    ("what is farming?", None),
+    ("support", None),
+    ("I am a farmer", None),
+    ("how to start farming", "guide"),
+    ("micro irrigation", "tip"),
+])
+def test_generic_words_do_not_pick_a_scheme(question, source):
+    assert ask_assistant(question).source == source
+
+
+def test_crop_name_beats_generic_tip():
+    assert ask_assistant("best soil for tomato").source == "crop:Tomato"
+
+
+def test_unknown_question_falls_back():
+    assert ask_assistant("quantum spaceship").source is None
+
+
+def test_quiz_answers_are_not_revealed():
+    for q in question_bank("English"):
+        assert f"✅ {q.answer}" not in farming_ai(q.question)
@@ -0,0 +1,23 @@
+from farmquest_export import archive_name, roster_from_store
+from farmquest_progress import SQLiteProgressStore
+
+
+def test_archive_name_keeps_tamil_vowel_signs():
+    assert archive_name("முருகன்", set()) == "முருகன்_FarmQuest_Certificate.pdf"
+
+
+def test_archive_name_replaces_unsafe_characters_and_dedupes():
+    used = set()
+    assert archive_name("a/b:c", used) == "a_b_c_FarmQuest_Certificate.pdf"
+    assert archive_name("a\\b?c", used) == "a_b_c_2_FarmQuest_Certificate.pdf"
+    assert archive_name("..", used) == "player_FarmQuest_Certificate.pdf"
+
+
+def test_roster_from_store_lists_finished_players(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = SQLiteProgressStore(path)
+    store.save("Ravi", 40, 3)
+    store.save("Asha", 200, 11, completed=True)
+    store.close()
+
+    assert [username for username, _ in roster_from_store(path)] == ["Asha"]
@@ -0,0 +1,50 @@
+import io
+
+import pandas as pd
+import pytest
+
+from farmquest_irrigation import DEFAULT_SEASON_DAYS, EFFICIENCY, load_rainfall, plan_irrigation
+
+
+def test_header_only_rainfall_is_rejected():
+    with pytest.raises(ValueError, match="no rows"):
+        load_rainfall(io.StringIO("date,rainfall\n"))
+
+
+def rainfall_series(days, mm=0.0):
+    return pd.Series(mm, index=pd.date_range("2024-06-01", periods=days, freq="D"), dtype=float)
+
+
+def test_dry_season_needs_the_whole_crop_demand():
+    plots = pd.DataFrame({"plot": ["a"], "crop": ["tomato"], "area": [2.0]})
+    totals, weekly = plan_irrigation(plots, rainfall_series(DEFAULT_SEASON_DAYS))
+    row = totals.iloc[0]
+    # Tomato wants 600–800 mm; the Kc curve spreads the midpoint over the season
+    assert row.demand_mm == pytest.approx(700, rel=0.01)
+    assert row.net_mm == row.demand_mm
+    assert row.rain_used_mm == 0
+    assert row.drip_m3 == pytest.approx(row.net_mm * 2 * 10 / EFFICIENCY["drip"], rel=1e-3)
+    assert row.saved_m3 == pytest.approx(row.flood_m3 - row.drip_m3, abs=0.1)
+    assert row.coverage == 1
+    assert weekly["net_mm"].sum() == pytest.approx(row.net_mm, abs=1)
+
+
+def test_rain_covers_demand():
+    plots = pd.DataFrame({"crop": ["Tomato"], "area": [1.0]})
+    totals, weekly = plan_irrigation(plots, rainfall_series(DEFAULT_SEASON_DAYS, mm=50.0))
+    assert totals.iloc[0].net_mm == 0
+    assert pd.isna(totals.iloc[0].peak_week)
+    assert weekly["flood_events"].sum() == 0
+
+
+def test_late_sowing_only_partly_covered():
+    plots = pd.DataFrame({"crop": ["Tomato", "Tomato"], "area": [1.0, 1.0],
+                          "sown_on": ["2024-07-01", None], "season_days": [60, 60]})
+    totals, _ = plan_irrigation(plots, rainfall_series(60))
+    assert totals["coverage"].tolist() == [0.5, 1.0]
+    assert totals.iloc[0].net_mm < totals.iloc[1].net_mm
+
+
+def test_unknown_crop_is_rejected():
+    with pytest.raises(ValueError, match="Unknown crop"):
+        plan_irrigation(pd.DataFrame({"crop": ["Banana"], "area": [1.0]}), rainfall_series(10))
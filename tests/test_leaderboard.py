@@ -0,0 +1,46 @@
+from farmquest_leaderboard import Leaderboard, RankedSet
+from farmquest_progress import MemoryProgressStore, Progress
+
+
+def test_ranked_set_orders_and_moves_players():
+    ranks = RankedSet()
+    ranks.upsert("Asha", (-50,))
+    ranks.upsert("Ravi", (-80,))
+    ranks.upsert("Mani", (-10,))
+    assert [key[-1] for key in ranks.top(3)] == ["Ravi", "Asha", "Mani"]
+    assert ranks.rank("Asha") == 2
+
+    ranks.upsert("Mani", (-100,))
+    assert ranks.rank("Mani") == 1
+    assert ranks.rank("Ravi") == 2
+    assert len(ranks) == 3
+
+    ranks.remove("Ravi")
+    assert ranks.rank("Ravi") is None
+    assert [key[-1] for key in ranks.top(5)] == ["Mani", "Asha"]
+
+
+def test_xp_ties_go_to_whoever_got_there_first():
+    board = Leaderboard()
+    board.record(Progress("Ravi", 100, 5, 0.0, 20.0, None))
+    board.record(Progress("Asha", 100, 5, 0.0, 10.0, None))
+    assert board.top_xp() == [("Asha", 100), ("Ravi", 100)]
+    assert board.rank_xp("Ravi") == 2
+
+
+def test_older_rows_do_not_overwrite_newer_ones():
+    board = Leaderboard()
+    board.record(Progress("Asha", 200, 11, 0.0, 50.0, 50.0))
+    board.record(Progress("Asha", 40, 3, 0.0, 30.0, None))
+    assert board.top_xp() == [("Asha", 200)]
+    assert board.top_time() == [("Asha", 50.0)]
+
+
+def test_snapshot_syncs_from_the_store():
+    store = MemoryProgressStore()
+    store.save("Asha", 200, 11, completed=True)
+    store.save("Ravi", 40, 3)
+    snapshot = Leaderboard(store, refresh_interval=0).snapshot()
+    assert snapshot["players"] == 2
+    assert [name for name, _ in snapshot["xp"]] == ["Asha", "Ravi"]
+    assert [name for name, _ in snapshot["time"]] == ["Asha"]
@@ -0,0 +1,49 @@
+import sqlite3
+import threading
+import time
+
+from farmquest_progress import SQLiteProgressStore
+
+
+def test_save_after_flush_keeps_stored_timestamps(tmp_path):
+    store = SQLiteProgressStore(str(tmp_path / "progress.db"))
+    try:
+        first = store.save("Asha", 0, 1)
+        store.flush()
+
+        finished = store.save("Asha", 200, 11, completed=True)
+        assert finished.started_at == first.started_at
+        store.flush()
+
+        later = store.save("Asha", 220, 11)
+        assert later.started_at == first.started_at
+        assert later.completed_at == finished.completed_at
+        assert store.load("Asha") == later
+    finally:
+        store.close()
+
+
+def test_load_during_flush_sees_the_flushing_row(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = SQLiteProgressStore(path, flush_interval=60)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    try:
+        store.save("Asha", 0, 1)
+        store.flush()
+        newer = store.save("Asha", 50, 3)
+
+        # Hold the write lock so the flush waits inside its transaction
+        blocker.execute("BEGIN IMMEDIATE")
+        flusher = threading.Thread(target=store.flush)
+        flusher.start()
+        while not store._inflight:
+            time.sleep(0.01)
+        assert store.load("Asha") == newer
+        assert store.save("Asha", 60, 4).started_at == newer.started_at
+
+        blocker.execute("COMMIT")
+        flusher.join()
+        assert store.load("Asha").xp == 60
+    finally:
+        blocker.close()
+        store.close()
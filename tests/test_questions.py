@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from farmquest_questions import QuestionBank, compile_bank, level_count, question_bank
+
+TOPICS = ["soil", "water", "pests"]
+
+
+@pytest.fixture
+def bank(tmp_path):
+    source = tmp_path / "bank.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for i in range(30):
+            f.write(json.dumps({
+                "id": f"q-{i:02}",
+                "topic": TOPICS[i % len(TOPICS)],
+                "question": f"மண் கேள்வி {i}?",
+                "options": ["a", "b", f"c{i}"],
+                "answer": f"c{i}",
+            }, ensure_ascii=False) + "\n")
+    target = tmp_path / "bank.fqb"
+    assert compile_bank(source, target) == 30
+    return QuestionBank(target)
+
+
+def test_packed_bank_round_trip(bank):
+    assert len(bank) == 30
+    assert bank.topics == TOPICS
+    q = bank.get(7)
+    assert q == ("q-07", "water", "மண் கேள்வி 7?", ["a", "b", "c7"], "c7")
+    assert bank.find("q-07") == q
+    assert bank.find("missing") is None
+    assert [q.id for q in bank][:3] == ["q-00", "q-01", "q-02"]
+
+
+def test_topic_lookup(bank):
+    assert list(bank.topic_indices("pests")) == list(range(2, 30, 3))
+    assert bank.by_topic("pests", 1).id == "q-05"
+
+
+def test_player_plan_has_no_repeats_and_is_stable(bank):
+    plan = bank.player_plan("Asha", 10)
+    assert len(set(plan.tolist())) == 10
+    assert list(plan) == sorted(plan)
+    assert list(bank.player_plan("Asha", 10)) == list(plan)
+    assert [bank.level("Asha", level, 10).id for level in range(1, 11)] == [bank.get(int(i)).id for i in plan]
+
+    soil = bank.player_plan("Asha", 20, topic="soil")
+    assert len(soil) == 10
+    assert all(bank.get(int(i)).topic == "soil" for i in soil)
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    source = tmp_path / "dup.jsonl"
+    row = json.dumps({"id": "x", "topic": "t", "question": "?", "options": ["a"], "answer": "a"})
+    source.write_text(f"{row}\n{row}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="duplicate"):
+        compile_bank(source, tmp_path / "dup.fqb")
+
+
+def test_level_count_is_capped_by_the_bank(monkeypatch):
+    monkeypatch.setenv("FARMQUEST_LEVELS", "1000")
+    assert level_count() == len(question_bank("English"))
+    monkeypatch.setenv("FARMQUEST_LEVELS", "3")
+    assert level_count() == 3
+
+
+@pytest.mark.parametrize("configured", ["0", "-2"])
+def test_level_count_below_one_is_rejected(monkeypatch, configured):
+    monkeypatch.setenv("FARMQUEST_LEVELS", configured)
+    with pytest.raises(ValueError, match="at least 1"):
+        level_count()
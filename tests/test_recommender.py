@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from farmquest_recommender import crop_table, range_fit, recommend, recommend_plots, score_matrix, soil_index
+
+
+def test_range_fit_falls_off_linearly_outside_the_range():
+    fit = range_fit(np.array([500.0, 350.0, 250.0, 600.0, 900.0]), 300.0, 500.0)
+    assert fit.tolist() == [1.0, 1.0, 0.75, 0.5, 0.0]
+
+
+def test_soil_index_accepts_any_case_and_rejects_unknown():
+    assert soil_index([" loamy", "CLAY"]).tolist() == [0, 3]
+    with pytest.raises(ValueError, match="Unknown soil"):
+        soil_index(["Loamy", "Gravel"])
+
+
+def test_perfect_match_scores_one():
+    best = recommend(400, 20, "Sandy", top_n=3)
+    assert best.iloc[0].crop == "Carrot"
+    assert best.iloc[0].score == 1.0
+    assert best["score"].is_monotonic_decreasing
+
+
+def test_batch_scores_match_single_plots():
+    plots = pd.DataFrame({
+        "rainfall": [400, 1800, 650],
+        "temperature": [20, 28, 24],
+        "soil": ["Sandy", "Sandy loam", "Loamy"],
+    })
+    scores = score_matrix(plots["rainfall"], plots["temperature"], plots["soil"])
+    assert scores.shape == (3, len(crop_table()))
+
+    ranked = recommend_plots(plots, top_n=2)
+    for i, plot in plots.iterrows():
+        single = recommend(plot.rainfall, plot.temperature, plot.soil, top_n=1).iloc[0]
+        assert ranked.loc[i, "crop_1"] == single.crop
+        assert ranked.loc[i, "score_1"] == single.score
+    assert ranked.loc[1, "crop_1"] == "Coconut"